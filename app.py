@@ -11,30 +11,53 @@ Usage:
     cdk deploy -c environment=production
     cdk deploy -c environment=dev -c stack_type=minimal
 """
+import os
 import sys
-from typing import Optional
-
-import aws_cdk as cdk
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
 
 from n8n_deploy.config import ConfigLoader
 from n8n_deploy.config.models import DatabaseType
-from n8n_deploy.stacks import AccessStack, ComputeStack, NetworkStack, StorageStack
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    import aws_cdk as cdk
+
+
+def _preload_config() -> ConfigLoader:
+    """Read and validate the default system.yaml (run on a worker thread)."""
+    config_loader = ConfigLoader()
+    config_loader.get_available_environments()
+    return config_loader
 
 
-def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = None) -> None:
+def create_stacks(
+    app: "cdk.App",
+    environment: str,
+    stack_type: Optional[str] = None,
+    preloaded_config: Optional["Future[ConfigLoader]"] = None,
+) -> None:
     """Create all stacks for the specified environment.
 
     Args:
         app: CDK application
         environment: Environment name from system.yaml
         stack_type: Optional stack type (minimal, standard, enterprise)
+        preloaded_config: Optional pending load of the default system.yaml
     """
+    import aws_cdk as cdk
+
+    from n8n_deploy.stacks import AccessStack, ComputeStack, NetworkStack, StorageStack
+
     # Load configuration
     try:
         # Check if a custom config path is provided
         config_path = app.node.try_get_context("config_path")
         if config_path:
             config_loader = ConfigLoader(config_path)
+        elif preloaded_config is not None:
+            config_loader = preloaded_config.result()
         else:
             config_loader = ConfigLoader()
         config = config_loader.load_config(environment, stack_type)
@@ -177,6 +200,16 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
 
 def main():
     """Main entry point for the CDK application."""
+    # Opt-in: read system.yaml on a worker thread while aws_cdk is imported. Stacks are still
+    # constructed on this thread because the jsii kernel behind aws_cdk is not thread-safe.
+    preloaded_config = None
+    if os.environ.get("N8N_PARALLEL_SYNTH") == "1":
+        executor = ThreadPoolExecutor(max_workers=1)
+        preloaded_config = executor.submit(_preload_config)
+        executor.shutdown(wait=False)
+
+    import aws_cdk as cdk
+
     app = cdk.App()
 
     # Get environment from context
@@ -201,7 +234,7 @@ def main():
     stack_type = app.node.try_get_context("stack_type")
 
     # Create stacks
-    create_stacks(app, environment, stack_type)
+    create_stacks(app, environment, stack_type, preloaded_config)
 
     app.synth()
 
@@ -1,7 +1,7 @@
 """Configuration loader for system.yaml."""
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 import yaml
 from pydantic import ValidationError
@@ -12,15 +12,17 @@ from .models import EnvironmentConfig, N8nConfig
 class ConfigLoader:
     """Load and validate configuration from system.yaml."""
 
-    def __init__(self, config_file: str = "system.yaml"):
+    def __init__(self, config_file: str = "system.yaml", raw_config: Optional[Mapping[str, Any]] = None):
         """Initialize config loader.
 
         Args:
             config_file: Path to configuration file (default: system.yaml)
+            raw_config: Optional already-parsed configuration; when given, config_file is not read
         """
         self.config_file = Path(config_file)
         self._config: Optional[N8nConfig] = None
-        self._raw_config: Optional[Dict[str, Any]] = None
+        self._raw_config: Optional[Mapping[str, Any]] = raw_config
+        self._raw_config_injected = raw_config is not None
 
     def load_config(
         self,
@@ -43,7 +45,7 @@ class ConfigLoader:
             ValueError: If environment not found or validation fails
         """
         # Load raw configuration
-        if not self._raw_config:
+        if self._raw_config is None:
             self._load_raw_config()
 
         # Validate base configuration
@@ -169,7 +171,8 @@ class ConfigLoader:
     def get_available_environments(self) -> list[str]:
         """Get list of available environments."""
         if not self._config:
-            self._load_raw_config()
+            if self._raw_config is None:
+                self._load_raw_config()
             self._validate_config()
 
         return list(self._config.environments.keys()) if self._config else []
@@ -177,7 +180,8 @@ class ConfigLoader:
     def get_available_stack_types(self) -> list[str]:
         """Get list of available stack types."""
         if not self._config:
-            self._load_raw_config()
+            if self._raw_config is None:
+                self._load_raw_config()
             self._validate_config()
 
         return list(self._config.stacks.keys()) if self._config and self._config.stacks else []
@@ -189,7 +193,8 @@ class ConfigLoader:
             True if valid, raises exception otherwise
         """
         try:
-            self._load_raw_config()
+            if not self._raw_config_injected:
+                self._load_raw_config()
             self._validate_config()
             return True
         except Exception as e:
@@ -66,6 +66,7 @@ class ScalingConfig(BaseModel):
     target_cpu_utilization: int = Field(70, ge=10, le=90)
     scale_in_cooldown: int = Field(300, ge=60)
     scale_out_cooldown: int = Field(60, ge=60)
+    enable_memory_scaling: bool = True
 
     @validator("max_tasks")
     def validate_max_tasks(cls, max_tasks, values):
@@ -201,6 +202,8 @@ class MonitoringConfig(BaseModel):
     enable_container_insights: bool = True
     enable_xray_tracing: bool = False
     custom_metrics_namespace: str = "N8n/Serverless"
+    dashboard_enabled: bool = True
+    custom_metrics_enabled: bool = True
 
 
 class BackupConfig(BaseModel):
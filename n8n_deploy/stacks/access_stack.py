@@ -1,6 +1,7 @@
 """Access stack for API Gateway and CloudFront."""
 
-from typing import Optional
+import functools
+from typing import Optional, Tuple
 
 from aws_cdk import Duration
 from aws_cdk import aws_apigatewayv2 as apigatewayv2
@@ -18,6 +19,60 @@ from ..config.models import AccessType, N8nConfig
 from .base_stack import N8nBaseStack
 from .compute_stack import ComputeStack
 
+# CORS wildcards shared by allowed origins/headers and methods
+_CORS_ALL = ["*"]
+_CORS_ALL_METHODS = [apigatewayv2.CorsHttpMethod.ANY]
+
+# n8n container port; Port is an immutable value object, so one instance is shared
+_N8N_PORT = ec2.Port.tcp(5678)
+
+# Webhook and REST API calls always go to the origin
+_DYNAMIC_PATHS = ("/webhook/*", "/rest/*")
+
+# n8n editor assets are fingerprinted, so they can be cached at the edge
+_STATIC_ASSET_PATHS = ("/assets/*", "/icons/*", "/static/*")
+
+
+@functools.lru_cache(maxsize=None)
+def _static_waf_rules() -> Tuple[waf.CfnWebACL.RuleProperty, ...]:
+    """Return the WAF rules shared by every web ACL, built on first use."""
+    return (
+        # AWS Managed Rules - Common Rule Set
+        waf.CfnWebACL.RuleProperty(
+            name="AWSManagedRulesCommonRuleSet",
+            priority=10,
+            override_action=waf.CfnWebACL.OverrideActionProperty(none={}),
+            statement=waf.CfnWebACL.StatementProperty(
+                managed_rule_group_statement=waf.CfnWebACL.ManagedRuleGroupStatementProperty(
+                    vendor_name="AWS",
+                    name="AWSManagedRulesCommonRuleSet",
+                )
+            ),
+            visibility_config=waf.CfnWebACL.VisibilityConfigProperty(
+                sampled_requests_enabled=True,
+                cloud_watch_metrics_enabled=True,
+                metric_name="CommonRuleSet",
+            ),
+        ),
+        # Rate limiting
+        waf.CfnWebACL.RuleProperty(
+            name="RateLimitRule",
+            priority=20,
+            statement=waf.CfnWebACL.StatementProperty(
+                rate_based_statement=waf.CfnWebACL.RateBasedStatementProperty(
+                    limit=2000,  # requests per 5 minutes per IP
+                    aggregate_key_type="IP",
+                )
+            ),
+            action=waf.CfnWebACL.RuleActionProperty(block=waf.CfnWebACL.BlockActionProperty()),
+            visibility_config=waf.CfnWebACL.VisibilityConfigProperty(
+                sampled_requests_enabled=True,
+                cloud_watch_metrics_enabled=True,
+                metric_name="RateLimitRule",
+            ),
+        ),
+    )
+
 
 class AccessStack(N8nBaseStack):
     """Stack for API access layer (API Gateway, CloudFront, WAF)."""
@@ -44,10 +99,22 @@ class AccessStack(N8nBaseStack):
         super().__init__(scope, construct_id, config, environment, **kwargs)
 
         self.compute_stack = compute_stack
-        self.access_config = self.env_config.settings.access
+        self.access_config = access_config = self.env_config.settings.access
+
+        # Resolve the access settings once
+        is_api_gateway = not access_config or access_config.type is AccessType.API_GATEWAY
+        cloudfront_enabled = bool(access_config and access_config.cloudfront_enabled)
+        waf_enabled = cloudfront_enabled and access_config.waf_enabled
+        domain_name = access_config.domain_name if access_config else None
+
+        # Resources below are only created for API Gateway access
+        self.vpc_link = None
+        self.api = None
+        self.distribution = None
+        self.web_acl = None
 
         # Check if we should create API Gateway resources
-        if not self.access_config or self.access_config.type == AccessType.API_GATEWAY:
+        if is_api_gateway:
             # Create VPC link for API Gateway
             self.vpc_link = self._create_vpc_link()
 
@@ -55,25 +122,21 @@ class AccessStack(N8nBaseStack):
             self.api = self._create_api_gateway()
 
             # Create CloudFront distribution if enabled
-            if self.access_config and self.access_config.cloudfront_enabled:
+            if cloudfront_enabled:
                 self.distribution = self._create_cloudfront_distribution()
 
                 # Create WAF if enabled
-                if self.access_config.waf_enabled:
+                if waf_enabled:
                     self.web_acl = self._create_waf_web_acl()
                     self._associate_waf_with_cloudfront()
 
             # Set up custom domain if provided
-            if self.access_config and self.access_config.domain_name:
+            if domain_name:
                 self._setup_custom_domain()
-        else:
-            # Using Cloudflare Tunnel - no API Gateway resources needed
-            self.vpc_link = None
-            self.api = None
-            self.distribution = None
 
         # Add outputs
-        self._add_outputs()
+        if self.emit_outputs:
+            self._add_outputs()
 
     def _create_vpc_link(self) -> apigatewayv2.VpcLink:
         """Create VPC link for API Gateway to connect to ECS service."""
@@ -82,7 +145,7 @@ class AccessStack(N8nBaseStack):
             "VpcLink",
             vpc_link_name=self.get_resource_name("vpc-link"),
             vpc=self.compute_stack.network_stack.vpc,
-            subnets=ec2.SubnetSelection(subnets=self.compute_stack.network_stack.subnets),
+            subnets=self.compute_stack.network_stack.subnet_selection,
             security_groups=[self.compute_stack.network_stack.n8n_security_group],
         )
 
@@ -93,11 +156,12 @@ class AccessStack(N8nBaseStack):
         # Allow API Gateway to access n8n service
         self.compute_stack.service_security_group.add_ingress_rule(
             peer=ec2.Peer.ipv4(self.compute_stack.network_stack.vpc.vpc_cidr_block),
-            connection=ec2.Port.tcp(5678),
+            connection=_N8N_PORT,
             description="Allow API Gateway to access n8n",
         )
 
-        # Create HTTP API
+        # Create HTTP API. HTTP APIs only have regional endpoints (there is no
+        # edge-optimized variant), so CloudFront stays the single edge hop.
         api = apigatewayv2.HttpApi(
             self,
             "HttpApi",
@@ -105,9 +169,9 @@ class AccessStack(N8nBaseStack):
             description=f"n8n API for {self.environment_name}",
             cors_preflight=(
                 apigatewayv2.CorsPreflightOptions(
-                    allow_origins=self.access_config.cors_origins if self.access_config else ["*"],
-                    allow_methods=[apigatewayv2.CorsHttpMethod.ANY],
-                    allow_headers=["*"],
+                    allow_origins=self.access_config.cors_origins if self.access_config else _CORS_ALL,
+                    allow_methods=_CORS_ALL_METHODS,
+                    allow_headers=_CORS_ALL,
                     max_age=Duration.days(1),
                 )
                 if self.access_config
@@ -117,7 +181,10 @@ class AccessStack(N8nBaseStack):
 
         # Create service discovery integration
         # Check if CloudMap service is available
-        cloud_map_service = getattr(self.compute_stack.n8n_service.service, "cloud_map_service", None)
+        try:
+            cloud_map_service = self.compute_stack.n8n_service.service.cloud_map_service
+        except AttributeError:
+            cloud_map_service = None
 
         if cloud_map_service:
             integration = apigatewayv2_integrations.HttpServiceDiscoveryIntegration(
@@ -158,49 +225,17 @@ class AccessStack(N8nBaseStack):
         # Get or create certificate
         certificate = self._get_or_create_certificate()
 
-        # Create origin request policy
-        origin_request_policy = cloudfront.OriginRequestPolicy(
-            self,
-            "OriginRequestPolicy",
-            origin_request_policy_name=self.get_resource_name("origin-policy"),
-            header_behavior=cloudfront.OriginRequestHeaderBehavior.allow_list(
-                "Accept",
-                "Accept-Language",
-                "Content-Type",
-                "Host",
-                "Origin",
-                "Referer",
-                "User-Agent",
-                "CloudFront-Forwarded-Proto",
-                "CloudFront-Is-Desktop-Viewer",
-                "CloudFront-Is-Mobile-Viewer",
-                "CloudFront-Is-Tablet-Viewer",
-                "CloudFront-Viewer-Country",
-            ),
-            query_string_behavior=cloudfront.OriginRequestQueryStringBehavior.all(),
-            cookie_behavior=cloudfront.OriginRequestCookieBehavior.all(),
-        )
-
-        # Create cache policy for dynamic content
-        cache_policy = cloudfront.CachePolicy(
-            self,
-            "CachePolicy",
-            cache_policy_name=self.get_resource_name("cache-policy"),
-            default_ttl=Duration.seconds(0),
-            max_ttl=Duration.seconds(1),
-            min_ttl=Duration.seconds(0),
-            enable_accept_encoding_gzip=True,
-            enable_accept_encoding_brotli=True,
-            header_behavior=cloudfront.CacheHeaderBehavior.allow_list(
-                "Authorization",
-                "CloudFront-Forwarded-Proto",
-                "CloudFront-Is-Desktop-Viewer",
-                "CloudFront-Is-Mobile-Viewer",
-                "CloudFront-Is-Tablet-Viewer",
-                "Host",
-            ),
-            query_string_behavior=cloudfront.CacheQueryStringBehavior.all(),
-            cookie_behavior=cloudfront.CacheCookieBehavior.all(),
+        # AWS-managed policies are plain references, not extra resources: forward
+        # every viewer header except Host (API Gateway needs its own) and never
+        # cache dynamic responses.
+        origin_request_policy = cloudfront.OriginRequestPolicy.ALL_VIEWER_EXCEPT_HOST_HEADER
+        cache_policy = cloudfront.CachePolicy.CACHING_DISABLED
+
+        # Single API Gateway origin shared by every behavior. The execute-api
+        # hostname of an HTTP API is the regional endpoint, not another edge.
+        api_origin = origins.HttpOrigin(
+            f"{self.api.api_id}.execute-api.{self.region}.amazonaws.com",
+            protocol_policy=cloudfront.OriginProtocolPolicy.HTTPS_ONLY,
         )
 
         # Create distribution
@@ -208,10 +243,7 @@ class AccessStack(N8nBaseStack):
             self,
             "Distribution",
             default_behavior=cloudfront.BehaviorOptions(
-                origin=origins.HttpOrigin(
-                    f"{self.api.api_id}.execute-api.{self.region}.amazonaws.com",
-                    protocol_policy=cloudfront.OriginProtocolPolicy.HTTPS_ONLY,
-                ),
+                origin=api_origin,
                 viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
                 allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
                 cache_policy=cache_policy,
@@ -223,9 +255,7 @@ class AccessStack(N8nBaseStack):
             certificate=certificate,
             minimum_protocol_version=cloudfront.SecurityPolicyProtocol.TLS_V1_2_2021,
             price_class=(
-                cloudfront.PriceClass.PRICE_CLASS_100
-                if self.is_development()
-                else cloudfront.PriceClass.PRICE_CLASS_ALL
+                cloudfront.PriceClass.PRICE_CLASS_100 if self._is_dev else cloudfront.PriceClass.PRICE_CLASS_ALL
             ),
             enabled=True,
             http_version=cloudfront.HttpVersion.HTTP2_AND_3,
@@ -234,34 +264,47 @@ class AccessStack(N8nBaseStack):
         )
 
         # Add cache behaviors for specific paths
-        distribution.add_behavior(
-            "/webhook/*",
-            origins.HttpOrigin(
-                f"{self.api.api_id}.execute-api.{self.region}.amazonaws.com",
-                protocol_policy=cloudfront.OriginProtocolPolicy.HTTPS_ONLY,
-            ),
-            viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.HTTPS_ONLY,
-            allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
-            cache_policy=cloudfront.CachePolicy.CACHING_DISABLED,
-            origin_request_policy=origin_request_policy,
-        )
+        for path in _DYNAMIC_PATHS:
+            distribution.add_behavior(
+                path,
+                api_origin,
+                viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.HTTPS_ONLY,
+                allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
+                cache_policy=cache_policy,
+                origin_request_policy=origin_request_policy,
+            )
 
-        distribution.add_behavior(
-            "/rest/*",
-            origins.HttpOrigin(
-                f"{self.api.api_id}.execute-api.{self.region}.amazonaws.com",
-                protocol_policy=cloudfront.OriginProtocolPolicy.HTTPS_ONLY,
-            ),
-            viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.HTTPS_ONLY,
-            allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
-            cache_policy=cloudfront.CachePolicy.CACHING_DISABLED,
-            origin_request_policy=origin_request_policy,
+        # Cache static editor assets at the edge
+        static_cache_policy = cloudfront.CachePolicy(
+            self,
+            "StaticCachePolicy",
+            cache_policy_name=self.get_resource_name("static-cache-policy"),
+            default_ttl=Duration.hours(24),
+            max_ttl=Duration.days(365),
+            min_ttl=Duration.seconds(1),
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True,
+            header_behavior=cloudfront.CacheHeaderBehavior.none(),
+            query_string_behavior=cloudfront.CacheQueryStringBehavior.none(),
+            cookie_behavior=cloudfront.CacheCookieBehavior.none(),
         )
 
+        for path in _STATIC_ASSET_PATHS:
+            distribution.add_behavior(
+                path,
+                api_origin,
+                viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                allowed_methods=cloudfront.AllowedMethods.ALLOW_GET_HEAD,
+                cached_methods=cloudfront.CachedMethods.CACHE_GET_HEAD,
+                cache_policy=static_cache_policy,
+            )
+
         return distribution
 
     def _create_waf_web_acl(self) -> waf.CfnWebACL:
         """Create WAF web ACL for CloudFront."""
+        waf_name = self.get_resource_name("waf")
+
         # IP whitelist rules
         ip_rules = []
         if self.access_config and self.access_config.ip_whitelist:
@@ -275,72 +318,40 @@ class AccessStack(N8nBaseStack):
             )
 
             ip_rules.append(
-                {
-                    "name": "IPWhitelistRule",
-                    "priority": 1,
-                    "statement": {
-                        "ipSetReferenceStatement": {
-                            "arn": ip_set.attr_arn,
-                        }
-                    },
-                    "action": {"allow": {}},
-                    "visibilityConfig": {
-                        "sampledRequestsEnabled": True,
-                        "cloudWatchMetricsEnabled": True,
-                        "metricName": "IPWhitelistRule",
-                    },
-                }
+                waf.CfnWebACL.RuleProperty(
+                    name="IPWhitelistRule",
+                    priority=1,
+                    statement=waf.CfnWebACL.StatementProperty(
+                        ip_set_reference_statement=waf.CfnWebACL.IPSetReferenceStatementProperty(
+                            arn=ip_set.attr_arn,
+                        )
+                    ),
+                    action=waf.CfnWebACL.RuleActionProperty(allow=waf.CfnWebACL.AllowActionProperty()),
+                    visibility_config=waf.CfnWebACL.VisibilityConfigProperty(
+                        sampled_requests_enabled=True,
+                        cloud_watch_metrics_enabled=True,
+                        metric_name="IPWhitelistRule",
+                    ),
+                )
             )
 
         # Create Web ACL
         web_acl = waf.CfnWebACL(
             self,
             "WebAcl",
-            name=self.get_resource_name("waf"),
+            name=waf_name,
             scope="CLOUDFRONT",
-            default_action={"allow": {}} if not ip_rules else {"block": {}},
-            rules=[
-                # AWS Managed Rules - Common Rule Set
-                {
-                    "name": "AWSManagedRulesCommonRuleSet",
-                    "priority": 10,
-                    "overrideAction": {"none": {}},
-                    "statement": {
-                        "managedRuleGroupStatement": {
-                            "vendorName": "AWS",
-                            "name": "AWSManagedRulesCommonRuleSet",
-                        }
-                    },
-                    "visibilityConfig": {
-                        "sampledRequestsEnabled": True,
-                        "cloudWatchMetricsEnabled": True,
-                        "metricName": "CommonRuleSet",
-                    },
-                },
-                # Rate limiting
-                {
-                    "name": "RateLimitRule",
-                    "priority": 20,
-                    "statement": {
-                        "rateBasedStatement": {
-                            "limit": 2000,  # requests per 5 minutes per IP
-                            "aggregateKeyType": "IP",
-                        }
-                    },
-                    "action": {"block": {}},
-                    "visibilityConfig": {
-                        "sampledRequestsEnabled": True,
-                        "cloudWatchMetricsEnabled": True,
-                        "metricName": "RateLimitRule",
-                    },
-                },
-                *ip_rules,
-            ],
-            visibility_config={
-                "sampledRequestsEnabled": True,
-                "cloudWatchMetricsEnabled": True,
-                "metricName": self.get_resource_name("waf"),
-            },
+            default_action=(
+                waf.CfnWebACL.DefaultActionProperty(block=waf.CfnWebACL.BlockActionProperty())
+                if ip_rules
+                else waf.CfnWebACL.DefaultActionProperty(allow=waf.CfnWebACL.AllowActionProperty())
+            ),
+            rules=[*_static_waf_rules(), *ip_rules],
+            visibility_config=waf.CfnWebACL.VisibilityConfigProperty(
+                sampled_requests_enabled=True,
+                cloud_watch_metrics_enabled=True,
+                metric_name=waf_name,
+            ),
         )
 
         return web_acl
@@ -379,11 +390,11 @@ class AccessStack(N8nBaseStack):
             self,
             "HostedZone",
             hosted_zone_id=zone_id,
-            zone_name=".".join(self.access_config.domain_name.split(".")[-2:]),
+            zone_name=".".join(self.access_config.domain_name.rsplit(".", 2)[-2:]),
         )
 
         # Create A record
-        if hasattr(self, "distribution"):
+        if self.distribution is not None:
             route53.ARecord(
                 self,
                 "ARecord",
@@ -394,8 +405,10 @@ class AccessStack(N8nBaseStack):
 
     def _add_outputs(self) -> None:
         """Add stack outputs."""
+        access_config = self.access_config
+
         # Check access type and add appropriate outputs
-        if not self.access_config or self.access_config.type == AccessType.API_GATEWAY:
+        if not access_config or access_config.type is AccessType.API_GATEWAY:
             # API Gateway outputs
             if self.api:
                 self.add_output(
@@ -413,15 +426,15 @@ class AccessStack(N8nBaseStack):
                 description="Access method is Cloudflare Tunnel",
             )
 
-            if self.access_config.cloudflare and self.access_config.cloudflare.tunnel_domain:
+            if access_config.cloudflare and access_config.cloudflare.tunnel_domain:
                 self.add_output(
                     "AccessUrl",
-                    value=f"https://{self.access_config.cloudflare.tunnel_domain}",
+                    value=f"https://{access_config.cloudflare.tunnel_domain}",
                     description="n8n access URL via Cloudflare Tunnel",
                 )
 
         # CloudFront outputs
-        if hasattr(self, "distribution") and self.distribution is not None:
+        if self.distribution is not None:
             self.add_output(
                 "DistributionUrl",
                 value=f"https://{self.distribution.distribution_domain_name}",
@@ -434,9 +447,9 @@ class AccessStack(N8nBaseStack):
                 description="CloudFront distribution ID",
             )
 
-            if self.access_config and self.access_config.domain_name:
+            if access_config and access_config.domain_name:
                 self.add_output(
                     "CustomDomainUrl",
-                    value=f"https://{self.access_config.domain_name}",
+                    value=f"https://{access_config.domain_name}",
                     description="Custom domain URL",
                 )
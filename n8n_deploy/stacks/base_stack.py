@@ -1,12 +1,35 @@
 """Base stack with common patterns for all n8n stacks."""
 
-from typing import Dict, Optional
+import os
+import re
+from types import MappingProxyType
+from typing import Dict, Optional, Set
 
-from aws_cdk import CfnOutput, RemovalPolicy, Stack, Tags
+from aws_cdk import CfnOutput, Environment, RemovalPolicy, Stack, Tags
 from constructs import Construct
 
 from ..config.models import N8nConfig
 
+# Opt-in fast path for listing-only runs (e.g. `CDK_FAST_SYNTH=1 cdk ls`)
+_FAST_SYNTH = os.environ.get("CDK_FAST_SYNTH") == "1"
+
+# Common outputs that should be exported for cross-stack references
+_EXPORTABLE_OUTPUTS = re.compile(
+    "|".join(
+        (
+            "VpcId",
+            "SubnetIds",
+            "SecurityGroupId",
+            "ClusterArn",
+            "ServiceArn",
+            "LoadBalancerUrl",
+            "ApiUrl",
+            "DatabaseEndpoint",
+            "FileSystemId",
+        )
+    )
+)
+
 
 class N8nBaseStack(Stack):
     """Base stack class with common functionality for all n8n stacks."""
@@ -17,6 +40,11 @@ class N8nBaseStack(Stack):
         construct_id: str,
         config: N8nConfig,
         environment: str,
+        *,
+        env: Optional[Environment] = None,
+        description: Optional[str] = None,
+        stack_name: Optional[str] = None,
+        termination_protection: Optional[bool] = None,
         **kwargs,
     ) -> None:
         """Initialize base stack.
@@ -26,11 +54,21 @@ class N8nBaseStack(Stack):
             construct_id: Stack ID
             config: N8n configuration
             environment: Environment name (dev, staging, production)
+            env: Target account/region
+            description: Stack description (defaults to one derived from the ID)
+            stack_name: Explicit CloudFormation stack name
+            termination_protection: Override termination protection (on for production)
             **kwargs: Additional stack properties
         """
         # Get environment config
         self.config = config
         self._environment = environment
+        self._project_name = config.global_config.project_name
+        self._stack_prefix = f"{self._project_name}-{environment}"
+        self._name_prefix = self._stack_prefix + "-"
+        self._env_lower = env_lower = environment.lower()
+        self._is_prod = env_lower in ("production", "prod")
+        self._is_dev = env_lower in ("development", "dev")
         self.env_config = config.get_environment(environment)
 
         if not self.env_config:
@@ -39,42 +77,73 @@ class N8nBaseStack(Stack):
         # Merge with defaults
         self.env_config = config.merge_with_defaults(self.env_config)
 
-        # Set stack properties
-        stack_props = {
-            "description": f"n8n Serverless - {construct_id} - {environment}",
-            "termination_protection": environment == "production",
-        }
+        # Read-only view of feature flags, shared by all lookups on this stack
+        self._features = MappingProxyType(self.env_config.settings.features or {})
 
-        # Merge with provided kwargs
-        stack_props.update(kwargs)
+        # Set stack properties
+        if description is None:
+            description = f"n8n Serverless - {construct_id} - {environment}"
+        if termination_protection is None:
+            termination_protection = env_lower == "production"
+
+        super().__init__(
+            scope,
+            construct_id,
+            env=env,
+            description=description,
+            stack_name=stack_name,
+            termination_protection=termination_protection,
+            **kwargs,
+        )
+        self._stack_name = self.stack_name
 
-        super().__init__(scope, construct_id, **stack_props)
+        # Apply tags (skipped on the fast path, tags are not needed to list stacks)
+        if not _FAST_SYNTH:
+            self._apply_tags()
 
-        # Apply tags
-        self._apply_tags()
+        # Outputs are skipped on the fast path or with `-c emit_outputs=false`
+        self.emit_outputs = not _FAST_SYNTH and self.node.try_get_context("emit_outputs") not in (False, "false")
 
         # Set removal policy based on environment
-        self.removal_policy = RemovalPolicy.DESTROY if environment == "dev" else RemovalPolicy.RETAIN
+        self.removal_policy = RemovalPolicy.DESTROY if env_lower == "dev" else RemovalPolicy.RETAIN
+
+        # Stacks this stack already depends on (by id), see depend_on()
+        self._dependencies: Set[int] = set()
 
     def _apply_tags(self) -> None:
         """Apply tags to all resources in the stack."""
+        tags = Tags.of(self)
+        env_name = self.environment_name
+
         # Global tags
         if self.config.global_config.tags:
             for key, value in self.config.global_config.tags.items():
                 # Replace template variables
-                tag_value = value.replace("{{ environment }}", self.environment_name)
-                Tags.of(self).add(key, tag_value)
+                if "{{" in value:
+                    value = value.replace("{{ environment }}", env_name)
+                tags.add(key, value)
 
         # Environment-specific tags
         if self.env_config and self.env_config.tags:
             for key, value in self.env_config.tags.items():
-                Tags.of(self).add(key, value)
+                tags.add(key, value)
 
         # Standard tags
-        Tags.of(self).add("Environment", self.environment_name)
-        Tags.of(self).add("Stack", self.stack_name)
-        Tags.of(self).add("ProjectName", self.config.global_config.project_name)
-        Tags.of(self).add("Organization", self.config.global_config.organization)
+        tags.add("Environment", env_name)
+        tags.add("Stack", self._stack_name)
+        tags.add("ProjectName", self.config.global_config.project_name)
+        tags.add("Organization", self.config.global_config.organization)
+
+    def depend_on(self, stack: Stack) -> None:
+        """Add a dependency on another stack, ignoring repeats.
+
+        Args:
+            stack: Stack that must be deployed before this one
+        """
+        key = id(stack)
+        if key not in self._dependencies:
+            self._dependencies.add(key)
+            self.add_dependency(stack)
 
     def get_resource_name(self, resource_type: str, name: str = "") -> str:
         """Generate consistent resource names.
@@ -86,16 +155,9 @@ class N8nBaseStack(Stack):
         Returns:
             Formatted resource name
         """
-        parts = [
-            self.config.global_config.project_name,
-            self.environment_name,
-            resource_type,
-        ]
-
         if name:
-            parts.append(name)
-
-        return "-".join(parts)
+            return f"{self._name_prefix}{resource_type}-{name}"
+        return self._name_prefix + resource_type
 
     def add_output(
         self,
@@ -115,7 +177,7 @@ class N8nBaseStack(Stack):
         Returns:
             CfnOutput instance
         """
-        output_id = f"{self.stack_name}-{name}"
+        output_id = f"{self._stack_name}-{name}"
 
         if export_name is None and self.should_export_output(name):
             export_name = output_id
@@ -124,7 +186,7 @@ class N8nBaseStack(Stack):
             self,
             name,
             value=value,
-            description=description or f"{name} for {self.stack_name}",
+            description=description or f"{name} for {self._stack_name}",
             export_name=export_name,
         )
 
@@ -137,20 +199,7 @@ class N8nBaseStack(Stack):
         Returns:
             True if output should be exported
         """
-        # Common outputs that should be exported
-        exportable_outputs = [
-            "VpcId",
-            "SubnetIds",
-            "SecurityGroupId",
-            "ClusterArn",
-            "ServiceArn",
-            "LoadBalancerUrl",
-            "ApiUrl",
-            "DatabaseEndpoint",
-            "FileSystemId",
-        ]
-
-        return any(export in output_name for export in exportable_outputs)
+        return _EXPORTABLE_OUTPUTS.search(output_name) is not None
 
     def get_shared_resource(self, category: str, name: str) -> Optional[str]:
         """Get a shared resource ARN or ID from configuration.
@@ -173,25 +222,21 @@ class N8nBaseStack(Stack):
 
     def is_production(self) -> bool:
         """Check if this is a production environment."""
-        return self.environment_name.lower() in ["production", "prod"]
+        return self._is_prod
 
     def is_development(self) -> bool:
         """Check if this is a development environment."""
-        return self.environment_name.lower() in ["development", "dev"]
+        return self._is_dev
 
     def get_cost_allocation_tags(self) -> Dict[str, str]:
         """Get cost allocation tags for the environment."""
-        tags = {}
+        cost_allocation_tags = self.config.global_config.cost_allocation_tags
+        if not cost_allocation_tags:
+            return {}
 
-        if self.config.global_config.cost_allocation_tags:
-            for tag_key in self.config.global_config.cost_allocation_tags:
-                # Check if tag exists in global or environment tags
-                if self.config.global_config.tags and tag_key in self.config.global_config.tags:
-                    tags[tag_key] = self.config.global_config.tags[tag_key]
-                elif self.env_config.tags and tag_key in self.env_config.tags:
-                    tags[tag_key] = self.env_config.tags[tag_key]
-
-        return tags
+        # Global tags take precedence over environment tags
+        available = {**(self.env_config.tags or {}), **(self.config.global_config.tags or {})}
+        return {key: available[key] for key in cost_allocation_tags if key in available}
 
     def get_component_enabled(self, component: str) -> bool:
         """Check if a component is enabled for this environment.
@@ -202,11 +247,7 @@ class N8nBaseStack(Stack):
         Returns:
             True if component is enabled
         """
-        if not self.env_config.settings.features:
-            return False
-
-        components = self.env_config.settings.features.get("components", [])
-        return component in components
+        return component in self._features.get("components", ())
 
     @property
     def environment_name(self) -> str:
@@ -216,7 +257,7 @@ class N8nBaseStack(Stack):
     @property
     def stack_prefix(self) -> str:
         """Get consistent stack prefix for resource naming."""
-        return f"{self.config.global_config.project_name}-{self.environment_name}"
+        return self._stack_prefix
 
     @property
     def is_spot_enabled(self) -> bool:
@@ -1,13 +1,16 @@
 """Compute stack for ECS cluster and Fargate services."""
 
-from typing import Optional
+import functools
+from operator import attrgetter
+from typing import Optional, Tuple
 
-from aws_cdk import Duration
+from aws_cdk import Duration, Environment
 from aws_cdk import aws_applicationautoscaling as autoscaling
 from aws_cdk import aws_cloudwatch as cloudwatch
 from aws_cdk import aws_ec2 as ec2
 from aws_cdk import aws_ecs as ecs
 from aws_cdk import aws_secretsmanager as secretsmanager
+from aws_cdk import aws_sns as sns
 from constructs import Construct
 
 from ..config.models import AccessType, N8nConfig
@@ -20,6 +23,48 @@ from .base_stack import N8nBaseStack
 from .network_stack import NetworkStack
 from .storage_stack import StorageStack
 
+# Optional ComputeStack behaviors, resolved once per stack into a bitmask
+_CLOUDFLARE = 1 << 0
+_AUTO_SCALING = 1 << 1
+_MEMORY_SCALING = 1 << 2
+_RESILIENCE = 1 << 3
+
+
+@functools.lru_cache(maxsize=128)
+def _seconds(amount: int) -> Duration:
+    """Return a shared Duration for a number of seconds."""
+    return Duration.seconds(amount)
+
+
+# Memory utilization (%) lower bound -> task count change for production step scaling
+_MEMORY_SCALING_STEPS = ((80, 1), (90, 2))
+
+
+@functools.lru_cache(maxsize=None)
+def _memory_scaling_steps() -> Tuple[autoscaling.ScalingInterval, ...]:
+    """Build the memory step-scaling intervals once per process."""
+    return tuple(autoscaling.ScalingInterval(lower=lower, change=change) for lower, change in _MEMORY_SCALING_STEPS)
+
+
+# (output name, attribute path on the stack, description) for unconditional outputs
+_OUTPUTS = (
+    ("ClusterName", attrgetter("cluster.cluster_name"), "ECS cluster name"),
+    ("ClusterArn", attrgetter("cluster.cluster_arn"), "ECS cluster ARN"),
+    ("ServiceName", attrgetter("n8n_service.service.service_name"), "n8n service name"),
+    ("ServiceArn", attrgetter("n8n_service.service.service_arn"), "n8n service ARN"),
+    ("TaskDefinitionArn", attrgetter("n8n_service.task_definition.task_definition_arn"), "Task definition ARN"),
+)
+
+_CLOUDFLARE_OUTPUTS = (
+    ("CloudflareTunnelName", attrgetter("cloudflare_config.tunnel_name"), "Cloudflare tunnel name"),
+    ("CloudflareTunnelDomain", attrgetter("cloudflare_config.tunnel_domain"), "Cloudflare tunnel domain"),
+    (
+        "CloudflareTunnelSecretArn",
+        attrgetter("cloudflare_config.tunnel_secret.secret_arn"),
+        "Cloudflare tunnel token secret ARN",
+    ),
+)
+
 
 class ComputeStack(N8nBaseStack):
     """Stack for compute resources (ECS cluster, Fargate service)."""
@@ -34,7 +79,11 @@ class ComputeStack(N8nBaseStack):
         storage_stack: StorageStack,
         database_endpoint: Optional[str] = None,
         database_secret: Optional[secretsmanager.ISecret] = None,
-        **kwargs,
+        *,
+        env: Optional[Environment] = None,
+        description: Optional[str] = None,
+        stack_name: Optional[str] = None,
+        termination_protection: Optional[bool] = None,
     ) -> None:
         """Initialize compute stack.
 
@@ -47,16 +96,29 @@ class ComputeStack(N8nBaseStack):
             storage_stack: Storage stack with EFS
             database_endpoint: Optional RDS endpoint
             database_secret: Optional database credentials secret
-            **kwargs: Additional stack properties
+            env: Target account/region
+            description: Stack description
+            stack_name: Explicit CloudFormation stack name
+            termination_protection: Override termination protection
         """
-        super().__init__(scope, construct_id, config, environment, **kwargs)
+        super().__init__(
+            scope,
+            construct_id,
+            config,
+            environment,
+            env=env,
+            description=description,
+            stack_name=stack_name,
+            termination_protection=termination_protection,
+        )
 
         self.network_stack = network_stack
         self.storage_stack = storage_stack
+        self.cloudflare_config: Optional[CloudflareTunnelConfiguration] = None
 
         # Add explicit dependencies
-        self.add_dependency(network_stack)
-        self.add_dependency(storage_stack)
+        self.depend_on(network_stack)
+        self.depend_on(storage_stack)
 
         # Create ECS cluster
         self.cluster = self._create_ecs_cluster()
@@ -77,27 +139,40 @@ class ComputeStack(N8nBaseStack):
             database_secret=database_secret,
         )
 
+        self._flags = flags = self._resolve_optional_features()
+
         # Add Cloudflare Tunnel if configured
-        if (
-            self.env_config.settings.access
-            and self.env_config.settings.access.type == AccessType.CLOUDFLARE
-            and self.env_config.settings.access.cloudflare
-        ):
+        if flags & _CLOUDFLARE:
             self._setup_cloudflare_tunnel()
 
         # Set up auto-scaling if enabled
-        if (
-            self.env_config.settings.scaling
-            and self.env_config.settings.scaling.max_tasks > self.env_config.settings.scaling.min_tasks
-        ):
+        if flags & _AUTO_SCALING:
             self._setup_auto_scaling()
 
         # Add resilience mechanisms if enabled
-        if self.env_config.settings.features and self.env_config.settings.features.get("resilience_enabled", False):
+        if flags & _RESILIENCE:
             self._add_resilience_mechanisms()
 
         # Add outputs
-        self._add_outputs()
+        if self.emit_outputs:
+            self._add_outputs()
+
+    def _resolve_optional_features(self) -> int:
+        """Pack the optional behaviors enabled for this environment into a bitmask."""
+        settings = self.env_config.settings
+        access = settings.access
+        scaling = settings.scaling
+
+        flags = 0
+        if access and access.type is AccessType.CLOUDFLARE and access.cloudflare:
+            flags |= _CLOUDFLARE
+        if scaling and scaling.max_tasks > scaling.min_tasks:
+            flags |= _AUTO_SCALING
+            if self._is_prod and scaling.enable_memory_scaling:
+                flags |= _MEMORY_SCALING
+        if self._features.get("resilience_enabled", False):
+            flags |= _RESILIENCE
+        return flags
 
     def _create_ecs_cluster(self) -> ecs.Cluster:
         """Create ECS cluster."""
@@ -121,7 +196,7 @@ class ComputeStack(N8nBaseStack):
         """Determine if Container Insights should be enabled."""
         if self.env_config.settings.monitoring:
             return self.env_config.settings.monitoring.enable_container_insights
-        return self.is_production()
+        return self._is_prod
 
     def _setup_auto_scaling(self) -> None:
         """Set up auto-scaling for the Fargate service."""
@@ -137,40 +212,32 @@ class ComputeStack(N8nBaseStack):
         scalable_target.scale_on_cpu_utilization(
             "CpuScaling",
             target_utilization_percent=scaling_config.target_cpu_utilization,
-            scale_in_cooldown=Duration.seconds(scaling_config.scale_in_cooldown),
-            scale_out_cooldown=Duration.seconds(scaling_config.scale_out_cooldown),
+            scale_in_cooldown=_seconds(scaling_config.scale_in_cooldown),
+            scale_out_cooldown=_seconds(scaling_config.scale_out_cooldown),
         )
 
-        # Memory-based scaling (optional)
-        if self.is_production():
-            scalable_target.scale_on_metric(
-                "MemoryScaling",
-                metric=cloudwatch.Metric(
-                    namespace="AWS/ECS",
-                    metric_name="MemoryUtilization",
-                    dimensions_map={
-                        "ServiceName": self.n8n_service.service.service_name,
-                        "ClusterName": self.cluster.cluster_name,
-                    },
-                ),
-                adjustment_type=autoscaling.AdjustmentType.CHANGE_IN_CAPACITY,
-                scaling_steps=[
-                    autoscaling.ScalingInterval(
-                        lower=80,
-                        change=1,
-                    ),
-                    autoscaling.ScalingInterval(
-                        lower=90,
-                        change=2,
-                    ),
-                ],
-                cooldown=Duration.seconds(300),
-            )
+        # Memory-based scaling (production only, can be disabled via config)
+        if not self._flags & _MEMORY_SCALING:
+            return
+
+        dims = {
+            "ServiceName": self.n8n_service.service.service_name,
+            "ClusterName": self.cluster.cluster_name,
+        }
+        scalable_target.scale_on_metric(
+            "MemoryScaling",
+            metric=cloudwatch.Metric(
+                namespace="AWS/ECS",
+                metric_name="MemoryUtilization",
+                dimensions_map=dims,
+            ),
+            adjustment_type=autoscaling.AdjustmentType.CHANGE_IN_CAPACITY,
+            scaling_steps=list(_memory_scaling_steps()),
+            cooldown=_seconds(300),
+        )
 
     def _add_resilience_mechanisms(self) -> None:
         """Add resilience mechanisms using ResilientN8n construct."""
-        from aws_cdk import aws_sns as sns
-
         from ..constructs.resilient_n8n import ResilientN8n
 
         # Create or get monitoring SNS topic
@@ -250,73 +317,30 @@ class ComputeStack(N8nBaseStack):
 
     def _add_outputs(self) -> None:
         """Add stack outputs."""
-        # Cluster outputs
-        self.add_output(
-            "ClusterName",
-            value=self.cluster.cluster_name,
-            description="ECS cluster name",
-        )
-
-        self.add_output("ClusterArn", value=self.cluster.cluster_arn, description="ECS cluster ARN")
-
-        # Service outputs
-        self.add_output(
-            "ServiceName",
-            value=self.n8n_service.service.service_name,
-            description="n8n service name",
-        )
-
-        self.add_output(
-            "ServiceArn",
-            value=self.n8n_service.service.service_arn,
-            description="n8n service ARN",
-        )
-
-        # Task definition
-        self.add_output(
-            "TaskDefinitionArn",
-            value=self.n8n_service.task_definition.task_definition_arn,
-            description="Task definition ARN",
-        )
+        add_output = self.add_output
+        for name, getter, description in _OUTPUTS:
+            add_output(name, value=getter(self), description=description)
 
         # CloudMap service (for internal DNS)
-        if self.n8n_service.service.cloud_map_service:
-            self.add_output(
+        cloud_map_service = self.n8n_service.service.cloud_map_service
+        if cloud_map_service:
+            add_output(
                 "ServiceDiscoveryName",
-                value=self.n8n_service.service.cloud_map_service.service_name,
+                value=cloud_map_service.service_name,
                 description="Service discovery name",
             )
 
         # Log group
-        self.add_output(
+        add_output(
             "LogGroupName",
             value=self.n8n_service.log_group.log_group_name,
             description="CloudWatch log group name",
         )
 
         # Cloudflare outputs if enabled
-        if (
-            self.env_config.settings.access
-            and self.env_config.settings.access.type == AccessType.CLOUDFLARE
-            and hasattr(self, "cloudflare_config")
-        ):
-            self.add_output(
-                "CloudflareTunnelName",
-                value=self.cloudflare_config.tunnel_name,
-                description="Cloudflare tunnel name",
-            )
-
-            self.add_output(
-                "CloudflareTunnelDomain",
-                value=self.cloudflare_config.tunnel_domain,
-                description="Cloudflare tunnel domain",
-            )
-
-            self.add_output(
-                "CloudflareTunnelSecretArn",
-                value=self.cloudflare_config.tunnel_secret.secret_arn,
-                description="Cloudflare tunnel token secret ARN",
-            )
+        if self.cloudflare_config is not None:
+            for name, getter, description in _CLOUDFLARE_OUTPUTS:
+                add_output(name, value=getter(self), description=description)
 
     @property
     def service(self) -> ecs.FargateService:
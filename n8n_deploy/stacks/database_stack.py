@@ -1,6 +1,9 @@
 """Database stack for optional RDS PostgreSQL."""
 
-from aws_cdk import Duration
+import functools
+from typing import Optional
+
+from aws_cdk import Duration, Environment, Names
 from aws_cdk import aws_ec2 as ec2
 from aws_cdk import aws_logs as logs
 from aws_cdk import aws_rds as rds
@@ -11,6 +14,39 @@ from ..config.models import DatabaseConfig, N8nConfig
 from .base_stack import N8nBaseStack
 from .network_stack import NetworkStack
 
+_POSTGRES_PORT = 5432
+
+# Credentials generated for new databases
+_SECRET_TEMPLATE = '{"username": "n8nadmin"}'
+_SECRET_EXCLUDE_CHARACTERS = " %+~`#$&*()|[]{}:;<>?!'/@\"\\"
+_SECRET_PASSWORD_LENGTH = 30
+
+
+@functools.lru_cache(maxsize=128)
+def _days(amount: int) -> Duration:
+    """Return a shared Duration for a number of days."""
+    return Duration.days(amount)
+
+
+# Retention for exported PostgreSQL logs, shared by the Aurora and RDS paths
+_LOG_RETENTION = logs.RetentionDays.ONE_MONTH
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_instance_type(spec: Optional[str]) -> ec2.InstanceType:
+    """Parse an RDS instance class string (e.g. "db.t4g.micro") into an instance type.
+
+    Falls back to db.t4g.micro (Graviton, for cost savings) when the spec is
+    missing or not in the "db.<class>.<size>" form.
+    """
+    parts = spec.split(".") if spec else []
+    if len(parts) == 3:
+        return ec2.InstanceType.of(
+            getattr(ec2.InstanceClass, parts[1].upper()),
+            getattr(ec2.InstanceSize, parts[2].upper()),
+        )
+    return ec2.InstanceType.of(ec2.InstanceClass.T4G, ec2.InstanceSize.MICRO)
+
 
 class DatabaseStack(N8nBaseStack):
     """Stack for RDS PostgreSQL database resources."""
@@ -22,7 +58,11 @@ class DatabaseStack(N8nBaseStack):
         config: N8nConfig,
         environment: str,
         network_stack: NetworkStack,
-        **kwargs,
+        *,
+        env: Optional[Environment] = None,
+        description: Optional[str] = None,
+        stack_name: Optional[str] = None,
+        termination_protection: Optional[bool] = None,
     ) -> None:
         """Initialize database stack.
 
@@ -32,12 +72,26 @@ class DatabaseStack(N8nBaseStack):
             config: N8n configuration
             environment: Environment name
             network_stack: Network stack with VPC and security groups
-            **kwargs: Additional stack properties
+            env: Target account/region
+            description: Stack description
+            stack_name: Explicit CloudFormation stack name
+            termination_protection: Override termination protection
         """
-        super().__init__(scope, construct_id, config, environment, **kwargs)
+        super().__init__(
+            scope,
+            construct_id,
+            config,
+            environment,
+            env=env,
+            description=description,
+            stack_name=stack_name,
+            termination_protection=termination_protection,
+        )
 
         self.network_stack = network_stack
         self.db_config = self.env_config.settings.database or DatabaseConfig()
+        self.endpoint: Optional[str] = None
+        self.secret: Optional[secretsmanager.ISecret] = None
 
         # Create database security group
         self.db_security_group = self._create_database_security_group()
@@ -52,7 +106,8 @@ class DatabaseStack(N8nBaseStack):
                 self._create_rds_instance()
 
         # Add outputs
-        self._add_outputs()
+        if self.emit_outputs:
+            self._add_outputs()
 
     def _create_database_security_group(self) -> ec2.SecurityGroup:
         """Create security group for database."""
@@ -65,10 +120,17 @@ class DatabaseStack(N8nBaseStack):
             allow_all_outbound=False,  # Databases don't need outbound
         )
 
-        # Allow access from n8n containers
-        sg.add_ingress_rule(
-            peer=self.network_stack.n8n_security_group,
-            connection=ec2.Port.tcp(5432),
+        # Allow access from n8n containers. Emitted as an L1 rule (same construct ID as
+        # add_ingress_rule would use, so the logical ID is unchanged) to skip the L2 peer handling.
+        peer = self.network_stack.n8n_security_group
+        ec2.CfnSecurityGroupIngress(
+            sg,
+            f"from {Names.node_unique_id(peer.node)}:{_POSTGRES_PORT}",
+            group_id=sg.security_group_id,
+            ip_protocol="tcp",
+            from_port=_POSTGRES_PORT,
+            to_port=_POSTGRES_PORT,
+            source_security_group_id=peer.security_group_id,
             description="Allow PostgreSQL access from n8n containers",
         )
 
@@ -86,33 +148,35 @@ class DatabaseStack(N8nBaseStack):
             secret_complete_arn=self.db_config.connection_secret_arn,
         )
 
-        # Extract endpoint from secret (this is a simplified version)
-        # In practice, you'd need to handle this more robustly
-        self.endpoint = None  # Will be resolved from secret at runtime
+        # The endpoint stays None here: it is resolved from the secret at runtime
 
-    def _create_aurora_serverless(self) -> None:
-        """Create Aurora Serverless v2 PostgreSQL cluster."""
-        # Create credentials secret
-        self.secret = secretsmanager.Secret(
+    def _create_database_secret(self) -> secretsmanager.Secret:
+        """Create the generated credentials secret for a new database."""
+        return secretsmanager.Secret(
             self,
             "DatabaseSecret",
             secret_name=f"n8n/{self.environment_name}/db-credentials",
             description=f"n8n database credentials for {self.environment_name}",
             generate_secret_string=secretsmanager.SecretStringGenerator(
-                secret_string_template='{"username": "n8nadmin"}',
+                secret_string_template=_SECRET_TEMPLATE,
                 generate_string_key="password",
-                exclude_characters=" %+~`#$&*()|[]{}:;<>?!'/@\"\\",
-                password_length=30,
+                exclude_characters=_SECRET_EXCLUDE_CHARACTERS,
+                password_length=_SECRET_PASSWORD_LENGTH,
             ),
         )
 
+    def _create_aurora_serverless(self) -> None:
+        """Create Aurora Serverless v2 PostgreSQL cluster."""
+        # Create credentials secret
+        self.secret = self._create_database_secret()
+
         # Create subnet group
         subnet_group = rds.SubnetGroup(
             self,
             "SubnetGroup",
             description=f"Subnet group for n8n {self.environment_name}",
             vpc=self.network_stack.vpc,
-            vpc_subnets=ec2.SubnetSelection(subnets=self.network_stack.subnets),
+            vpc_subnets=self.network_stack.subnet_selection,
             removal_policy=self.removal_policy,
         )
 
@@ -134,14 +198,14 @@ class DatabaseStack(N8nBaseStack):
             subnet_group=subnet_group,
             security_groups=[self.db_security_group],
             backup=rds.BackupProps(
-                retention=Duration.days(self.db_config.backup_retention_days),
+                retention=_days(self.db_config.backup_retention_days),
                 preferred_window="03:00-04:00",
             ),
             enable_data_api=True,  # Enable Data API for serverless access
             storage_encrypted=True,
             cloudwatch_logs_exports=["postgresql"],
-            cloudwatch_logs_retention=logs.RetentionDays.ONE_MONTH,
-            deletion_protection=self.is_production(),
+            cloudwatch_logs_retention=_LOG_RETENTION,
+            deletion_protection=self._is_prod,
             removal_policy=self.removal_policy,
         )
 
@@ -152,7 +216,7 @@ class DatabaseStack(N8nBaseStack):
                 ec2.InstanceClass.T3,
                 ec2.InstanceSize.MEDIUM,
             ),
-            enable_performance_insights=self.is_production(),
+            enable_performance_insights=self._is_prod,
         )
 
         self.endpoint = self.cluster.cluster_endpoint.socket_address
@@ -160,34 +224,10 @@ class DatabaseStack(N8nBaseStack):
     def _create_rds_instance(self) -> None:
         """Create standard RDS PostgreSQL instance."""
         # Create credentials secret
-        self.secret = secretsmanager.Secret(
-            self,
-            "DatabaseSecret",
-            secret_name=f"n8n/{self.environment_name}/db-credentials",
-            description=f"n8n database credentials for {self.environment_name}",
-            generate_secret_string=secretsmanager.SecretStringGenerator(
-                secret_string_template='{"username": "n8nadmin"}',
-                generate_string_key="password",
-                exclude_characters=" %+~`#$&*()|[]{}:;<>?!'/@\"\\",
-                password_length=30,
-            ),
-        )
+        self.secret = self._create_database_secret()
 
         # Determine instance class
-        instance_class = ec2.InstanceType.of(
-            ec2.InstanceClass.T4G,  # Graviton for cost savings
-            ec2.InstanceSize.MICRO,
-        )
-        if self.db_config.instance_class:
-            # Parse instance class from string (e.g., "db.t4g.micro")
-            parts = self.db_config.instance_class.split(".")
-            if len(parts) == 3:
-                class_name = parts[1].upper()
-                size_name = parts[2].upper()
-                instance_class = ec2.InstanceType.of(
-                    getattr(ec2.InstanceClass, class_name),
-                    getattr(ec2.InstanceSize, size_name),
-                )
+        instance_class = _parse_instance_type(self.db_config.instance_class)
 
         # Create RDS instance
         self.instance = rds.DatabaseInstance(
@@ -199,18 +239,18 @@ class DatabaseStack(N8nBaseStack):
             database_name="n8n",
             instance_identifier=self.get_resource_name("rds"),
             vpc=self.network_stack.vpc,
-            vpc_subnets=ec2.SubnetSelection(subnets=self.network_stack.subnets),
+            vpc_subnets=self.network_stack.subnet_selection,
             security_groups=[self.db_security_group],
             allocated_storage=20,  # Minimum for PostgreSQL
             storage_type=rds.StorageType.GP3,
             multi_az=self.db_config.multi_az,
-            backup_retention=Duration.days(self.db_config.backup_retention_days),
+            backup_retention=_days(self.db_config.backup_retention_days),
             preferred_backup_window="03:00-04:00",
             preferred_maintenance_window="sun:04:00-sun:05:00",
-            enable_performance_insights=self.is_production(),
+            enable_performance_insights=self._is_prod,
             cloudwatch_logs_exports=["postgresql"],
-            cloudwatch_logs_retention=logs.RetentionDays.ONE_MONTH,
-            deletion_protection=self.is_production(),
+            cloudwatch_logs_retention=_LOG_RETENTION,
+            deletion_protection=self._is_prod,
             removal_policy=self.removal_policy,
             # Cost optimization
             publicly_accessible=False,
@@ -218,25 +258,24 @@ class DatabaseStack(N8nBaseStack):
             auto_minor_version_upgrade=False,  # Control updates
         )
 
-        self.endpoint = self.instance.db_instance_endpoint_address + ":" + self.instance.db_instance_endpoint_port
+        self.endpoint = f"{self.instance.db_instance_endpoint_address}:{self.instance.db_instance_endpoint_port}"
 
     def _add_outputs(self) -> None:
         """Add stack outputs."""
+        outputs = []
+
         # Database endpoint
-        if hasattr(self, "endpoint") and self.endpoint:
-            self.add_output("DatabaseEndpoint", value=self.endpoint, description="Database endpoint")
+        if self.endpoint is not None:
+            outputs.append(("DatabaseEndpoint", self.endpoint, "Database endpoint"))
 
         # Secret ARN
-        if hasattr(self, "secret"):
-            self.add_output(
-                "DatabaseSecretArn",
-                value=self.secret.secret_arn,
-                description="Database credentials secret ARN",
-            )
+        if self.secret is not None:
+            outputs.append(("DatabaseSecretArn", self.secret.secret_arn, "Database credentials secret ARN"))
 
         # Security group
-        self.add_output(
-            "DatabaseSecurityGroupId",
-            value=self.db_security_group.security_group_id,
-            description="Database security group ID",
+        outputs.append(
+            ("DatabaseSecurityGroupId", self.db_security_group.security_group_id, "Database security group ID")
         )
+
+        for name, value, description in outputs:
+            self.add_output(name, value=value, description=description)
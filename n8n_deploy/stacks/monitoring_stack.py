@@ -1,13 +1,11 @@
 """Monitoring stack for CloudWatch alarms and dashboards."""
 
-from typing import Optional
+from typing import Dict, Optional
 
 from aws_cdk import Duration
 from aws_cdk import aws_cloudwatch as cloudwatch
 from aws_cdk import aws_cloudwatch_actions as cloudwatch_actions
-from aws_cdk import aws_logs as logs
 from aws_cdk import aws_sns as sns
-from aws_cdk import aws_sns_subscriptions as sns_subscriptions
 from constructs import Construct
 
 from ..config.models import AccessType, N8nConfig
@@ -16,6 +14,165 @@ from .compute_stack import ComputeStack
 from .database_stack import DatabaseStack
 from .storage_stack import StorageStack
 
+# Durations are immutable, so metric periods share one instance each
+_DAY = Duration.days(1)
+_FIVE_MINUTES = Duration.minutes(5)
+
+_GREATER_THAN = cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD
+_LESS_THAN = cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD
+_BREACHING = cloudwatch.TreatMissingData.BREACHING
+_NOT_BREACHING = cloudwatch.TreatMissingData.NOT_BREACHING
+
+# (construct id, name suffix, description, AWS/ECS metric,
+#  threshold, evaluation periods, datapoints to alarm, comparison, missing data)
+_COMPUTE_ALARMS = (
+    (
+        "CpuAlarm",
+        "cpu-high",
+        "n8n CPU utilization is too high",
+        "CPUUtilization",
+        80,
+        3,
+        2,
+        _GREATER_THAN,
+        _NOT_BREACHING,
+    ),
+    (
+        "MemoryAlarm",
+        "memory-high",
+        "n8n memory utilization is too high",
+        "MemoryUtilization",
+        85,
+        3,
+        2,
+        _GREATER_THAN,
+        _NOT_BREACHING,
+    ),
+    (
+        "TaskCountAlarm",
+        "task-count-low",
+        "n8n service has insufficient running tasks",
+        "RunningTaskCount",
+        1,
+        2,
+        None,
+        _LESS_THAN,
+        _BREACHING,
+    ),
+)
+
+# (construct id, name suffix, description, custom metric, statistic,
+#  threshold, evaluation periods, datapoints to alarm, comparison, missing data)
+_CUSTOM_METRIC_ALARMS = (
+    (
+        "WebhookResponseTimeAlarm",
+        "webhook-response-time-high",
+        "Webhook response time is too high",
+        "WebhookResponseTime",
+        "Average",
+        1000,  # 1 second
+        3,
+        2,
+        _GREATER_THAN,
+        _NOT_BREACHING,
+    ),
+    (
+        "DatabaseErrorRateAlarm",
+        "database-error-rate-high",
+        "High database error rate detected",
+        "DatabaseConnectionErrors",  # only when a database stack is monitored
+        "Sum",
+        5,  # 5 errors in evaluation period
+        2,
+        None,
+        _GREATER_THAN,
+        _NOT_BREACHING,
+    ),
+)
+
+# (construct id, metric name, metric value, filter pattern, unit) for the n8n log metric filters.
+# CloudWatch allows one metric per filter, and default values cannot be combined with
+# dimensions, so each metric keeps its own filter.
+_LOG_METRIC_FILTERS = (
+    # Workflow executions
+    (
+        "WorkflowSuccessMetric",
+        "WorkflowExecutionSuccess",
+        "1",
+        '[timestamp, request_id, level="info", message="Workflow execution finished successfully*"]',
+        None,
+    ),
+    (
+        "WorkflowFailureMetric",
+        "WorkflowExecutionFailure",
+        "1",
+        '[timestamp, request_id, level="error", message="Workflow execution failed*"]',
+        None,
+    ),
+    (
+        "WorkflowDurationMetric",
+        "WorkflowExecutionDuration",
+        "$duration",
+        '[timestamp, request_id, level="info", message="Workflow execution finished*", duration]',
+        None,
+    ),
+    # Webhooks
+    (
+        "WebhookRequestMetric",
+        "WebhookRequests",
+        "1",
+        '[timestamp, request_id, level="info", message="Webhook received*"]',
+        None,
+    ),
+    (
+        "WebhookResponseTimeMetric",
+        "WebhookResponseTime",
+        "$response_time",
+        '[timestamp, request_id, level="info", message="Webhook processed*", response_time]',
+        cloudwatch.Unit.MILLISECONDS,
+    ),
+    # Errors
+    ("AuthErrorMetric", "AuthenticationErrors", "1", "Authentication failed || Unauthorized access", None),
+    (
+        "DatabaseErrorMetric",
+        "DatabaseConnectionErrors",
+        "1",
+        '[timestamp, request_id, level="error", message="Database connection failed*"]',
+        None,
+    ),
+    # Performance
+    (
+        "NodeExecutionTimeMetric",
+        "NodeExecutionTime",
+        "$execution_time",
+        '[timestamp, request_id, level="info", message="Node executed*", node_type, execution_time]',
+        cloudwatch.Unit.MILLISECONDS,
+    ),
+    (
+        "QueueDepthMetric",
+        "WorkflowQueueDepth",
+        "$queue_size",
+        '[timestamp, request_id, level="info", message="Queue status*", queue_size]',
+        None,
+    ),
+)
+
+# WorkflowFailureRate is published as 0 per successful and 100 per failed execution,
+# so its Average is the failure percentage and needs no metric math at query time.
+# These filters have no default value, which would otherwise dilute the average.
+_FAILURE_RATE_FILTERS = (
+    (
+        "WorkflowFailureRateSuccessMetric",
+        "0",
+        '[timestamp, request_id, level="info", message="Workflow execution finished successfully*"]',
+    ),
+    (
+        "WorkflowFailureRateFailureMetric",
+        "100",
+        '[timestamp, request_id, level="error", message="Workflow execution failed*"]',
+    ),
+)
+
 
 class MonitoringStack(N8nBaseStack):
     """Stack for monitoring resources (CloudWatch alarms, dashboards)."""
@@ -50,8 +207,17 @@ class MonitoringStack(N8nBaseStack):
         self.database_stack = database_stack
         self.monitoring_config = self.env_config.settings.monitoring
 
+        # Dimensions and log group shared by every ECS / EFS metric and log query
+        self._ecs_service_dims = {
+            "ServiceName": compute_stack.n8n_service.service.service_name,
+            "ClusterName": compute_stack.cluster.cluster_name,
+        }
+        self._efs_dims = {"FileSystemId": storage_stack.file_system.file_system_id} if storage_stack else None
+        self._log_group = compute_stack.n8n_service.log_group
+
         # Create SNS topic for alarms
         self.alarm_topic = self._create_alarm_topic()
+        self._alarm_action = cloudwatch_actions.SnsAction(self.alarm_topic)
 
         # Create alarms
         self._create_compute_alarms()
@@ -61,17 +227,64 @@ class MonitoringStack(N8nBaseStack):
             self._create_database_alarms()
 
         # Create Cloudflare Tunnel alarms if enabled
-        if self.env_config.settings.access and self.env_config.settings.access.type == AccessType.CLOUDFLARE:
+        if self.env_config.settings.access and self.env_config.settings.access.type is AccessType.CLOUDFLARE:
             self._create_cloudflare_tunnel_alarms()
 
         # Create dashboard
-        self.dashboard = self._create_dashboard()
+        self.dashboard: Optional[cloudwatch.Dashboard] = None
+        if not self.monitoring_config or self.monitoring_config.dashboard_enabled:
+            self.dashboard = self._create_dashboard()
 
         # Create custom n8n metrics
-        self._create_custom_n8n_metrics()
+        if not self.monitoring_config or self.monitoring_config.custom_metrics_enabled:
+            self._create_custom_n8n_metrics()
 
         # Add outputs
-        self._add_outputs()
+        if self.emit_outputs:
+            self._add_outputs()
+
+    def _ecs_metric(self, metric_name: str, statistic: str = "Average", **kwargs) -> cloudwatch.Metric:
+        """Build an AWS/ECS metric for the n8n service."""
+        return cloudwatch.Metric(
+            namespace="AWS/ECS",
+            metric_name=metric_name,
+            dimensions_map=self._ecs_service_dims,
+            statistic=statistic,
+            **kwargs,
+        )
+
+    def _efs_metric(self, metric_name: str, statistic: str = "Average", **kwargs) -> cloudwatch.Metric:
+        """Build an AWS/EFS metric for the n8n file system."""
+        return cloudwatch.Metric(
+            namespace="AWS/EFS",
+            metric_name=metric_name,
+            dimensions_map=self._efs_dims,
+            statistic=statistic,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _search(
+        namespace: str,
+        dims: Dict[str, str],
+        metric_name: str,
+        label: str,
+        statistic: str = "Average",
+    ) -> cloudwatch.MathExpression:
+        """Build a dashboard SEARCH() expression for one metric.
+
+        SEARCH results are fetched in a single GetMetricData query per widget,
+        so dashboards stay clear of per-metric throttling. Alarms cannot use
+        SEARCH and keep plain metrics.
+        """
+        schema = ",".join((namespace, *dims))
+        filters = " ".join(f'{key}="{value}"' for key, value in dims.items())
+        return cloudwatch.MathExpression(
+            expression=f"SEARCH('{{{schema}}} {filters} MetricName=\"{metric_name}\"', '{statistic}', 300)",
+            using_metrics={},
+            label=label,
+            period=_FIVE_MINUTES,
+        )
 
     def _create_alarm_topic(self) -> sns.Topic:
         """Create SNS topic for alarm notifications."""
@@ -84,141 +297,87 @@ class MonitoringStack(N8nBaseStack):
 
         # Add email subscription if configured
         if self.monitoring_config and self.monitoring_config.alarm_email:
+            from aws_cdk import aws_sns_subscriptions as sns_subscriptions
+
             topic.add_subscription(sns_subscriptions.EmailSubscription(self.monitoring_config.alarm_email))
 
         return topic
 
-    def _create_compute_alarms(self) -> None:
-        """Create alarms for compute resources."""
-        # Create alarm action
-        alarm_action = cloudwatch_actions.SnsAction(self.alarm_topic)
-
-        # CPU utilization alarm
-        cpu_alarm = cloudwatch.Alarm(
-            self,
-            "CpuAlarm",
-            alarm_name=f"{self.stack_prefix}-cpu-high",
-            alarm_description="n8n CPU utilization is too high",
-            metric=cloudwatch.Metric(
-                namespace="AWS/ECS",
-                metric_name="CPUUtilization",
-                dimensions_map={
-                    "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                    "ClusterName": self.compute_stack.cluster.cluster_name,
-                },
-                statistic="Average",
-            ),
-            threshold=80,
-            evaluation_periods=3,
-            datapoints_to_alarm=2,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
-        )
-        cpu_alarm.add_alarm_action(alarm_action)
-
-        # Memory utilization alarm
-        memory_alarm = cloudwatch.Alarm(
+    def _create_alarm(
+        self,
+        construct_id: str,
+        name_suffix: str,
+        description: str,
+        metric: cloudwatch.IMetric,
+        threshold: float,
+        evaluation_periods: int,
+        datapoints_to_alarm: Optional[int] = None,
+        comparison_operator: Optional[cloudwatch.ComparisonOperator] = None,
+        treat_missing_data: Optional[cloudwatch.TreatMissingData] = None,
+    ) -> cloudwatch.Alarm:
+        """Create an alarm named after the stack prefix and notify the alarm topic."""
+        alarm = cloudwatch.Alarm(
             self,
-            "MemoryAlarm",
-            alarm_name=f"{self.stack_prefix}-memory-high",
-            alarm_description="n8n memory utilization is too high",
-            metric=cloudwatch.Metric(
-                namespace="AWS/ECS",
-                metric_name="MemoryUtilization",
-                dimensions_map={
-                    "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                    "ClusterName": self.compute_stack.cluster.cluster_name,
-                },
-                statistic="Average",
-            ),
-            threshold=85,
-            evaluation_periods=3,
-            datapoints_to_alarm=2,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+            construct_id,
+            alarm_name=self._name_prefix + name_suffix,
+            alarm_description=description,
+            metric=metric,
+            threshold=threshold,
+            evaluation_periods=evaluation_periods,
+            datapoints_to_alarm=datapoints_to_alarm,
+            comparison_operator=comparison_operator,
+            treat_missing_data=treat_missing_data,
         )
-        memory_alarm.add_alarm_action(alarm_action)
+        alarm.add_alarm_action(self._alarm_action)
+        return alarm
 
-        # Task count alarm (service health)
-        task_count_alarm = cloudwatch.Alarm(
-            self,
-            "TaskCountAlarm",
-            alarm_name=f"{self.stack_prefix}-task-count-low",
-            alarm_description="n8n service has insufficient running tasks",
-            metric=cloudwatch.Metric(
-                namespace="AWS/ECS",
-                metric_name="RunningTaskCount",
-                dimensions_map={
-                    "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                    "ClusterName": self.compute_stack.cluster.cluster_name,
-                },
-                statistic="Average",
-            ),
-            threshold=1,
-            evaluation_periods=2,
-            comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.BREACHING,
-        )
-        task_count_alarm.add_alarm_action(alarm_action)
+    def _create_compute_alarms(self) -> None:
+        """Create alarms for compute resources."""
+        for construct_id, name_suffix, description, metric_name, *settings in _COMPUTE_ALARMS:
+            self._create_alarm(construct_id, name_suffix, description, self._ecs_metric(metric_name), *settings)
 
     def _create_storage_alarms(self) -> None:
         """Create alarms for storage resources."""
-        alarm_action = cloudwatch_actions.SnsAction(self.alarm_topic)
-
         # EFS burst credit balance alarm
-        burst_credit_alarm = cloudwatch.Alarm(
-            self,
+        self._create_alarm(
             "EfsBurstCreditAlarm",
-            alarm_name=f"{self.stack_prefix}-efs-burst-credits-low",
-            alarm_description="EFS burst credits are running low",
-            metric=cloudwatch.Metric(
-                namespace="AWS/EFS",
-                metric_name="BurstCreditBalance",
-                dimensions_map={
-                    "FileSystemId": self.storage_stack.file_system.file_system_id,
-                },
-                statistic="Average",
-            ),
+            "efs-burst-credits-low",
+            "EFS burst credits are running low",
+            self._efs_metric("BurstCreditBalance"),
             threshold=1000000000000,  # 1 TB in bytes
             evaluation_periods=1,
-            comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+            comparison_operator=_LESS_THAN,
+            treat_missing_data=_NOT_BREACHING,
         )
-        burst_credit_alarm.add_alarm_action(alarm_action)
 
     def _create_database_alarms(self) -> None:
         """Create alarms for database resources."""
         if not hasattr(self.database_stack, "instance") and not hasattr(self.database_stack, "cluster"):
             return
 
-        alarm_action = cloudwatch_actions.SnsAction(self.alarm_topic)
-
         # Database CPU alarm
         if hasattr(self.database_stack, "instance"):
             # RDS instance
-            db_cpu_alarm = cloudwatch.Alarm(
-                self,
+            instance = self.database_stack.instance
+            self._create_alarm(
                 "DatabaseCpuAlarm",
-                alarm_name=f"{self.stack_prefix}-db-cpu-high",
-                alarm_description="Database CPU utilization is too high",
-                metric=self.database_stack.instance.metric_cpu_utilization(),
+                "db-cpu-high",
+                "Database CPU utilization is too high",
+                instance.metric_cpu_utilization(),
                 threshold=80,
                 evaluation_periods=3,
                 datapoints_to_alarm=2,
             )
-            db_cpu_alarm.add_alarm_action(alarm_action)
 
             # Database connections alarm
-            db_connections_alarm = cloudwatch.Alarm(
-                self,
+            self._create_alarm(
                 "DatabaseConnectionsAlarm",
-                alarm_name=f"{self.stack_prefix}-db-connections-high",
-                alarm_description="Database connections are too high",
-                metric=self.database_stack.instance.metric_database_connections(),
+                "db-connections-high",
+                "Database connections are too high",
+                instance.metric_database_connections(),
                 threshold=50,  # Adjust based on instance class
                 evaluation_periods=2,
             )
-            db_connections_alarm.add_alarm_action(alarm_action)
 
         elif hasattr(self.database_stack, "cluster"):
             # Aurora cluster
@@ -227,7 +386,7 @@ class MonitoringStack(N8nBaseStack):
 
     def _create_cloudflare_tunnel_alarms(self) -> None:
         """Create alarms for Cloudflare Tunnel health."""
-        alarm_action = cloudwatch_actions.SnsAction(self.alarm_topic)
+        from aws_cdk import aws_logs as logs
 
         # Create custom metric namespace for Cloudflare
         cf_namespace = "Cloudflare/Tunnel"
@@ -236,7 +395,7 @@ class MonitoringStack(N8nBaseStack):
         logs.MetricFilter(
             self,
             "CloudflareTunnelHealthMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
+            log_group=self._log_group,
             metric_name="TunnelHealthy",
             metric_namespace=cf_namespace,
             metric_value="1",
@@ -250,7 +409,7 @@ class MonitoringStack(N8nBaseStack):
         logs.MetricFilter(
             self,
             "CloudflareTunnelErrorMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
+            log_group=self._log_group,
             metric_name="TunnelConnectionErrors",
             metric_namespace=cf_namespace,
             metric_value="1",
@@ -262,46 +421,38 @@ class MonitoringStack(N8nBaseStack):
         )
 
         # Tunnel metrics from container health check
-        tunnel_health_alarm = cloudwatch.Alarm(
-            self,
+        self._create_alarm(
             "CloudflareTunnelHealthAlarm",
-            alarm_name=f"{self.stack_prefix}-cloudflare-tunnel-unhealthy",
-            alarm_description="Cloudflare Tunnel is unhealthy",
-            metric=cloudwatch.Metric(
+            "cloudflare-tunnel-unhealthy",
+            "Cloudflare Tunnel is unhealthy",
+            cloudwatch.Metric(
                 namespace="AWS/ECS",
                 metric_name="ContainerHealthCheck",
-                dimensions_map={
-                    "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                    "ClusterName": self.compute_stack.cluster.cluster_name,
-                    "ContainerName": "cloudflare-tunnel",
-                },
+                dimensions_map={**self._ecs_service_dims, "ContainerName": "cloudflare-tunnel"},
                 statistic="Average",
             ),
             threshold=1,
             evaluation_periods=3,
             datapoints_to_alarm=2,
-            comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.BREACHING,
+            comparison_operator=_LESS_THAN,
+            treat_missing_data=_BREACHING,
         )
-        tunnel_health_alarm.add_alarm_action(alarm_action)
 
         # Connection error rate alarm
-        tunnel_error_alarm = cloudwatch.Alarm(
-            self,
+        self._create_alarm(
             "CloudflareTunnelErrorAlarm",
-            alarm_name=f"{self.stack_prefix}-cloudflare-tunnel-errors-high",
-            alarm_description="High Cloudflare Tunnel error rate",
-            metric=cloudwatch.Metric(
+            "cloudflare-tunnel-errors-high",
+            "High Cloudflare Tunnel error rate",
+            cloudwatch.Metric(
                 namespace=cf_namespace,
                 metric_name="TunnelConnectionErrors",
                 statistic="Sum",
             ),
             threshold=10,  # More than 10 errors in evaluation period
             evaluation_periods=2,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+            comparison_operator=_GREATER_THAN,
+            treat_missing_data=_NOT_BREACHING,
         )
-        tunnel_error_alarm.add_alarm_action(alarm_action)
 
     def _create_dashboard(self) -> cloudwatch.Dashboard:
         """Create CloudWatch dashboard."""
@@ -314,32 +465,15 @@ class MonitoringStack(N8nBaseStack):
         )
 
         # Add compute metrics
-        dashboard.add_widgets(
+        ecs_dims = self._ecs_service_dims
+        widgets = [
             cloudwatch.GraphWidget(
                 title="n8n Service Metrics",
                 left=[
-                    cloudwatch.Metric(
-                        namespace="AWS/ECS",
-                        metric_name="CPUUtilization",
-                        dimensions_map={
-                            "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                            "ClusterName": self.compute_stack.cluster.cluster_name,
-                        },
-                        statistic="Average",
-                        label="CPU %",
-                    ),
+                    self._search("AWS/ECS", ecs_dims, "CPUUtilization", "CPU %"),
                 ],
                 right=[
-                    cloudwatch.Metric(
-                        namespace="AWS/ECS",
-                        metric_name="MemoryUtilization",
-                        dimensions_map={
-                            "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                            "ClusterName": self.compute_stack.cluster.cluster_name,
-                        },
-                        statistic="Average",
-                        label="Memory %",
-                    ),
+                    self._search("AWS/ECS", ecs_dims, "MemoryUtilization", "Memory %"),
                 ],
                 width=12,
                 height=6,
@@ -347,37 +481,19 @@ class MonitoringStack(N8nBaseStack):
             cloudwatch.GraphWidget(
                 title="Task Count",
                 left=[
-                    cloudwatch.Metric(
-                        namespace="AWS/ECS",
-                        metric_name="RunningTaskCount",
-                        dimensions_map={
-                            "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                            "ClusterName": self.compute_stack.cluster.cluster_name,
-                        },
-                        statistic="Average",
-                        label="Running Tasks",
-                    ),
-                    cloudwatch.Metric(
-                        namespace="AWS/ECS",
-                        metric_name="DesiredTaskCount",
-                        dimensions_map={
-                            "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                            "ClusterName": self.compute_stack.cluster.cluster_name,
-                        },
-                        statistic="Average",
-                        label="Desired Tasks",
-                    ),
+                    self._search("AWS/ECS", ecs_dims, "RunningTaskCount", "Running Tasks"),
+                    self._search("AWS/ECS", ecs_dims, "DesiredTaskCount", "Desired Tasks"),
                 ],
                 width=12,
                 height=6,
             ),
-        )
+        ]
 
         # Add log insights widget
-        dashboard.add_widgets(
+        widgets.append(
             cloudwatch.LogQueryWidget(
                 title="Recent Errors",
-                log_group_names=[self.compute_stack.n8n_service.log_group.log_group_name],
+                log_group_names=[self._log_group.log_group_name],
                 width=24,
                 height=4,
                 query_lines=[
@@ -391,30 +507,14 @@ class MonitoringStack(N8nBaseStack):
 
         # Add storage metrics if available
         if self.storage_stack:
-            dashboard.add_widgets(
+            widgets.append(
                 cloudwatch.GraphWidget(
                     title="EFS Metrics",
                     left=[
-                        cloudwatch.Metric(
-                            namespace="AWS/EFS",
-                            metric_name="ClientConnections",
-                            dimensions_map={
-                                "FileSystemId": self.storage_stack.file_system.file_system_id,
-                            },
-                            statistic="Sum",
-                            label="Client Connections",
-                        ),
+                        self._search("AWS/EFS", self._efs_dims, "ClientConnections", "Client Connections", "Sum"),
                     ],
                     right=[
-                        cloudwatch.Metric(
-                            namespace="AWS/EFS",
-                            metric_name="BurstCreditBalance",
-                            dimensions_map={
-                                "FileSystemId": self.storage_stack.file_system.file_system_id,
-                            },
-                            statistic="Average",
-                            label="Burst Credits",
-                        ),
+                        self._search("AWS/EFS", self._efs_dims, "BurstCreditBalance", "Burst Credits"),
                     ],
                     width=12,
                     height=6,
@@ -422,8 +522,8 @@ class MonitoringStack(N8nBaseStack):
             )
 
         # Add Cloudflare Tunnel metrics if enabled
-        if self.env_config.settings.access and self.env_config.settings.access.type == AccessType.CLOUDFLARE:
-            dashboard.add_widgets(
+        if self.env_config.settings.access and self.env_config.settings.access.type is AccessType.CLOUDFLARE:
+            widgets += [
                 cloudwatch.GraphWidget(
                     title="Cloudflare Tunnel Health",
                     left=[
@@ -449,7 +549,7 @@ class MonitoringStack(N8nBaseStack):
                 ),
                 cloudwatch.LogQueryWidget(
                     title="Cloudflare Tunnel Logs",
-                    log_group_names=[self.compute_stack.n8n_service.log_group.log_group_name],
+                    log_group_names=[self._log_group.log_group_name],
                     width=12,
                     height=6,
                     query_lines=[
@@ -459,7 +559,9 @@ class MonitoringStack(N8nBaseStack):
                         "limit 20",
                     ],
                 ),
-            )
+            ]
+
+        dashboard.add_widgets(*widgets)
 
         return dashboard
 
@@ -471,266 +573,95 @@ class MonitoringStack(N8nBaseStack):
         )
 
         # Create custom metrics filters for log insights
-        self._create_workflow_execution_metrics(custom_namespace)
-        self._create_webhook_metrics(custom_namespace)
-        self._create_error_metrics(custom_namespace)
-        self._create_performance_metrics(custom_namespace)
+        self._create_log_metric_filters(custom_namespace)
 
         # Add custom metric alarms
         self._create_custom_metric_alarms(custom_namespace)
 
         # Add custom widgets to dashboard
-        self._add_custom_metrics_to_dashboard(custom_namespace)
-
-    def _create_workflow_execution_metrics(self, namespace: str) -> None:
-        """Create metrics for workflow executions."""
-        # Metric filter for successful workflow executions
-        logs.MetricFilter(
-            self,
-            "WorkflowSuccessMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="WorkflowExecutionSuccess",
-            metric_namespace=namespace,
-            metric_value="1",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="info", message="Workflow execution finished successfully*"]'
-            ),
-            default_value=0,
-        )
-
-        # Metric filter for failed workflow executions
-        logs.MetricFilter(
-            self,
-            "WorkflowFailureMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="WorkflowExecutionFailure",
-            metric_namespace=namespace,
-            metric_value="1",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="error", message="Workflow execution failed*"]'
-            ),
-            default_value=0,
-        )
-
-        # Metric filter for workflow execution duration
-        logs.MetricFilter(
-            self,
-            "WorkflowDurationMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="WorkflowExecutionDuration",
-            metric_namespace=namespace,
-            metric_value="$duration",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="info", message="Workflow execution finished*", duration]'
-            ),
-            default_value=0,
-        )
+        if self.dashboard is not None:
+            self._add_custom_metrics_to_dashboard(custom_namespace)
 
-    def _create_webhook_metrics(self, namespace: str) -> None:
-        """Create metrics for webhook handling."""
-        # Metric filter for webhook requests
-        logs.MetricFilter(
-            self,
-            "WebhookRequestMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="WebhookRequests",
-            metric_namespace=namespace,
-            metric_value="1",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="info", message="Webhook received*"]'
-            ),
-            default_value=0,
-        )
+    def _create_log_metric_filters(self, namespace: str) -> None:
+        """Create the n8n log metric filters (workflows, webhooks, errors, performance)."""
+        from aws_cdk import aws_logs as logs
 
-        # Metric filter for webhook response time
-        logs.MetricFilter(
-            self,
-            "WebhookResponseTimeMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="WebhookResponseTime",
-            metric_namespace=namespace,
-            metric_value="$response_time",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="info", message="Webhook processed*", response_time]'
-            ),
-            default_value=0,
-            unit=cloudwatch.Unit.MILLISECONDS,
-        )
-
-    def _create_error_metrics(self, namespace: str) -> None:
-        """Create metrics for error tracking."""
-        # Metric filter for authentication errors
-        logs.MetricFilter(
-            self,
-            "AuthErrorMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="AuthenticationErrors",
-            metric_namespace=namespace,
-            metric_value="1",
-            filter_pattern=logs.FilterPattern.literal("Authentication failed || Unauthorized access"),
-            default_value=0,
-        )
-
-        # Metric filter for database connection errors
-        logs.MetricFilter(
-            self,
-            "DatabaseErrorMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="DatabaseConnectionErrors",
-            metric_namespace=namespace,
-            metric_value="1",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="error", message="Database connection failed*"]'
-            ),
-            default_value=0,
-        )
-
-    def _create_performance_metrics(self, namespace: str) -> None:
-        """Create performance-related metrics."""
-        # Metric filter for node execution time
-        logs.MetricFilter(
-            self,
-            "NodeExecutionTimeMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="NodeExecutionTime",
-            metric_namespace=namespace,
-            metric_value="$execution_time",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="info", message="Node executed*", node_type, execution_time]'
-            ),
-            default_value=0,
-            unit=cloudwatch.Unit.MILLISECONDS,
-        )
-
-        # Metric filter for queue depth
-        logs.MetricFilter(
-            self,
-            "QueueDepthMetric",
-            log_group=self.compute_stack.n8n_service.log_group,
-            metric_name="WorkflowQueueDepth",
-            metric_namespace=namespace,
-            metric_value="$queue_size",
-            filter_pattern=logs.FilterPattern.literal(
-                '[timestamp, request_id, level="info", message="Queue status*", queue_size]'
-            ),
-            default_value=0,
-        )
+        log_group = self._log_group
+        for construct_id, metric_name, metric_value, pattern, unit in _LOG_METRIC_FILTERS:
+            logs.MetricFilter(
+                self,
+                construct_id,
+                log_group=log_group,
+                metric_name=metric_name,
+                metric_namespace=namespace,
+                metric_value=metric_value,
+                filter_pattern=logs.FilterPattern.literal(pattern),
+                default_value=0,
+                unit=unit,
+            )
+        for construct_id, metric_value, pattern in _FAILURE_RATE_FILTERS:
+            logs.MetricFilter(
+                self,
+                construct_id,
+                log_group=log_group,
+                metric_name="WorkflowFailureRate",
+                metric_namespace=namespace,
+                metric_value=metric_value,
+                filter_pattern=logs.FilterPattern.literal(pattern),
+                unit=cloudwatch.Unit.PERCENT,
+            )
 
     def _create_custom_metric_alarms(self, namespace: str) -> None:
         """Create alarms for custom n8n metrics."""
-        alarm_action = cloudwatch_actions.SnsAction(self.alarm_topic)
-
         # Workflow failure rate alarm
-        workflow_failure_alarm = cloudwatch.Alarm(
-            self,
+        self._create_alarm(
             "WorkflowFailureRateAlarm",
-            alarm_name=f"{self.stack_prefix}-workflow-failure-rate-high",
-            alarm_description="High workflow failure rate detected",
-            metric=cloudwatch.MathExpression(
-                expression="(failures / (successes + failures)) * 100",
-                using_metrics={
-                    "failures": cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WorkflowExecutionFailure",
-                        statistic="Sum",
-                        period=Duration.minutes(5),
-                    ),
-                    "successes": cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WorkflowExecutionSuccess",
-                        statistic="Sum",
-                        period=Duration.minutes(5),
-                    ),
-                },
+            "workflow-failure-rate-high",
+            "High workflow failure rate detected",
+            cloudwatch.Metric(
+                namespace=namespace,
+                metric_name="WorkflowFailureRate",
+                statistic="Average",
                 label="Workflow Failure Rate %",
-                period=Duration.minutes(5),
+                period=_FIVE_MINUTES,
             ),
             threshold=10,  # 10% failure rate
             evaluation_periods=3,
             datapoints_to_alarm=2,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+            comparison_operator=_GREATER_THAN,
+            treat_missing_data=_NOT_BREACHING,
         )
-        workflow_failure_alarm.add_alarm_action(alarm_action)
 
-        # Webhook response time alarm
-        webhook_response_alarm = cloudwatch.Alarm(
-            self,
-            "WebhookResponseTimeAlarm",
-            alarm_name=f"{self.stack_prefix}-webhook-response-time-high",
-            alarm_description="Webhook response time is too high",
-            metric=cloudwatch.Metric(
-                namespace=namespace,
-                metric_name="WebhookResponseTime",
-                statistic="Average",
-            ),
-            threshold=1000,  # 1 second
-            evaluation_periods=3,
-            datapoints_to_alarm=2,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
-        )
-        webhook_response_alarm.add_alarm_action(alarm_action)
-
-        # Database error rate alarm
-        if self.database_stack:
-            db_error_alarm = cloudwatch.Alarm(
-                self,
-                "DatabaseErrorRateAlarm",
-                alarm_name=f"{self.stack_prefix}-database-error-rate-high",
-                alarm_description="High database error rate detected",
-                metric=cloudwatch.Metric(
-                    namespace=namespace,
-                    metric_name="DatabaseConnectionErrors",
-                    statistic="Sum",
-                ),
-                threshold=5,  # 5 errors in evaluation period
-                evaluation_periods=2,
-                comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
-                treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
-            )
-            db_error_alarm.add_alarm_action(alarm_action)
+        # Webhook response time and database error alarms
+        for construct_id, name_suffix, description, metric_name, statistic, *settings in _CUSTOM_METRIC_ALARMS:
+            if metric_name == "DatabaseConnectionErrors" and not self.database_stack:
+                continue
+            metric = cloudwatch.Metric(namespace=namespace, metric_name=metric_name, statistic=statistic)
+            self._create_alarm(construct_id, name_suffix, description, metric, *settings)
 
     def _add_custom_metrics_to_dashboard(self, namespace: str) -> None:
         """Add custom n8n metrics widgets to the dashboard."""
-        # Workflow metrics widget
+
+        def metric(metric_name: str, statistic: str = "Average", **kwargs) -> cloudwatch.Metric:
+            return cloudwatch.Metric(namespace=namespace, metric_name=metric_name, statistic=statistic, **kwargs)
+
+        # Per-widget variants are with_() clones of these
+        successes = metric("WorkflowExecutionSuccess", "Sum")
+        failures = metric("WorkflowExecutionFailure", "Sum")
+        # Shared by the 24h success-rate and total-executions expressions
+        daily_successes = successes.with_(period=_DAY)
+        daily_failures = failures.with_(period=_DAY)
+
+        # Workflow metrics, performance and error tracking, laid out in a single pass
         self.dashboard.add_widgets(
             cloudwatch.GraphWidget(
                 title="Workflow Execution Metrics",
                 left=[
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WorkflowExecutionSuccess",
-                        statistic="Sum",
-                        label="Successful Executions",
-                        color=cloudwatch.Color.GREEN,
-                    ),
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WorkflowExecutionFailure",
-                        statistic="Sum",
-                        label="Failed Executions",
-                        color=cloudwatch.Color.RED,
-                    ),
+                    successes.with_(label="Successful Executions", color=cloudwatch.Color.GREEN),
+                    failures.with_(label="Failed Executions", color=cloudwatch.Color.RED),
                 ],
                 right=[
-                    cloudwatch.MathExpression(
-                        expression="(m2 / (m1 + m2)) * 100",
-                        using_metrics={
-                            "m1": cloudwatch.Metric(
-                                namespace=namespace,
-                                metric_name="WorkflowExecutionSuccess",
-                                statistic="Sum",
-                            ),
-                            "m2": cloudwatch.Metric(
-                                namespace=namespace,
-                                metric_name="WorkflowExecutionFailure",
-                                statistic="Sum",
-                            ),
-                        },
-                        label="Failure Rate %",
-                        color=cloudwatch.Color.ORANGE,
-                    ),
+                    metric("WorkflowFailureRate", label="Failure Rate %", color=cloudwatch.Color.ORANGE),
                 ],
                 width=12,
                 height=6,
@@ -738,135 +669,51 @@ class MonitoringStack(N8nBaseStack):
             cloudwatch.GraphWidget(
                 title="Webhook Performance",
                 left=[
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WebhookRequests",
-                        statistic="Sum",
-                        label="Total Requests",
-                    ),
+                    metric("WebhookRequests", "Sum", label="Total Requests"),
                 ],
                 right=[
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WebhookResponseTime",
-                        statistic="Average",
-                        label="Avg Response Time (ms)",
-                        color=cloudwatch.Color.BLUE,
-                    ),
+                    metric("WebhookResponseTime", label="Avg Response Time (ms)", color=cloudwatch.Color.BLUE),
                 ],
                 width=12,
                 height=6,
             ),
-        )
-
-        # Performance metrics widget
-        self.dashboard.add_widgets(
+            # Performance metrics widget
             cloudwatch.GraphWidget(
                 title="Performance Metrics",
                 left=[
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="NodeExecutionTime",
-                        statistic="Average",
-                        label="Avg Node Execution Time (ms)",
-                    ),
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WorkflowExecutionDuration",
-                        statistic="Average",
-                        label="Avg Workflow Duration (ms)",
-                    ),
+                    metric("NodeExecutionTime", label="Avg Node Execution Time (ms)"),
+                    metric("WorkflowExecutionDuration", label="Avg Workflow Duration (ms)"),
                 ],
                 right=[
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="WorkflowQueueDepth",
-                        statistic="Maximum",
-                        label="Max Queue Depth",
-                        color=cloudwatch.Color.PURPLE,
-                    ),
+                    metric("WorkflowQueueDepth", "Maximum", label="Max Queue Depth", color=cloudwatch.Color.PURPLE),
                 ],
                 width=24,
                 height=6,
             ),
-        )
-
-        # Error tracking widget
-        self.dashboard.add_widgets(
+            # Error tracking and workflow totals, queried together in one widget
             cloudwatch.SingleValueWidget(
-                title="Authentication Errors (24h)",
-                metrics=[
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="AuthenticationErrors",
-                        statistic="Sum",
-                        period=Duration.days(1),
-                    ),
-                ],
-                width=6,
-                height=4,
-            ),
-            cloudwatch.SingleValueWidget(
-                title="Database Errors (24h)",
-                metrics=[
-                    cloudwatch.Metric(
-                        namespace=namespace,
-                        metric_name="DatabaseConnectionErrors",
-                        statistic="Sum",
-                        period=Duration.days(1),
-                    ),
-                ],
-                width=6,
-                height=4,
-            ),
-            cloudwatch.SingleValueWidget(
-                title="Workflow Success Rate (24h)",
+                title="Errors & Success (24h)",
                 metrics=[
+                    metric("AuthenticationErrors", "Sum", label="Authentication Errors", period=_DAY),
+                    metric("DatabaseConnectionErrors", "Sum", label="Database Errors", period=_DAY),
                     cloudwatch.MathExpression(
                         expression="(successes / (successes + failures)) * 100",
                         using_metrics={
-                            "successes": cloudwatch.Metric(
-                                namespace=namespace,
-                                metric_name="WorkflowExecutionSuccess",
-                                statistic="Sum",
-                                period=Duration.days(1),
-                            ),
-                            "failures": cloudwatch.Metric(
-                                namespace=namespace,
-                                metric_name="WorkflowExecutionFailure",
-                                statistic="Sum",
-                                period=Duration.days(1),
-                            ),
+                            "successes": daily_successes,
+                            "failures": daily_failures,
                         },
                         label="Success Rate %",
                     ),
-                ],
-                width=6,
-                height=4,
-            ),
-            cloudwatch.SingleValueWidget(
-                title="Total Workflows (24h)",
-                metrics=[
                     cloudwatch.MathExpression(
                         expression="successes + failures",
                         using_metrics={
-                            "successes": cloudwatch.Metric(
-                                namespace=namespace,
-                                metric_name="WorkflowExecutionSuccess",
-                                statistic="Sum",
-                                period=Duration.days(1),
-                            ),
-                            "failures": cloudwatch.Metric(
-                                namespace=namespace,
-                                metric_name="WorkflowExecutionFailure",
-                                statistic="Sum",
-                                period=Duration.days(1),
-                            ),
+                            "successes": daily_successes,
+                            "failures": daily_failures,
                         },
                         label="Total Executions",
                     ),
                 ],
-                width=6,
+                width=24,
                 height=4,
             ),
         )
@@ -881,11 +728,12 @@ class MonitoringStack(N8nBaseStack):
         )
 
         # Dashboard URL
-        self.add_output(
-            "DashboardUrl",
-            value=(
-                f"https://{self.region}.console.aws.amazon.com/cloudwatch/home?"
-                f"region={self.region}#dashboards:name={self.dashboard.dashboard_name}"
-            ),
-            description="CloudWatch dashboard URL",
-        )
+        if self.dashboard is not None:
+            self.add_output(
+                "DashboardUrl",
+                value=(
+                    f"https://{self.region}.console.aws.amazon.com/cloudwatch/home?"
+                    f"region={self.region}#dashboards:name={self.dashboard.dashboard_name}"
+                ),
+                description="CloudWatch dashboard URL",
+            )
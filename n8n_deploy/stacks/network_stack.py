@@ -1,6 +1,7 @@
 """Network stack for VPC and related resources."""
 
-from typing import List
+import functools
+from typing import TYPE_CHECKING, List
 
 from aws_cdk import Fn
 from aws_cdk import aws_ec2 as ec2
@@ -9,6 +10,9 @@ from constructs import Construct
 from ..config.models import N8nConfig, NetworkingConfig
 from .base_stack import N8nBaseStack
 
+if TYPE_CHECKING:
+    from aws_cdk import aws_s3 as s3
+
 
 class NetworkStack(N8nBaseStack):
     """Stack for network resources (VPC, subnets, security groups)."""
@@ -37,7 +41,11 @@ class NetworkStack(N8nBaseStack):
         # Create or import VPC
         if self.network_config.use_existing_vpc:
             self.vpc = self._import_vpc()
-            self.subnets = self._import_subnets()
+            if self.network_config.subnet_ids:
+                # Configured subnets stay plain IDs until an ISubnet is needed, see subnets
+                self.subnet_ids = list(self.network_config.subnet_ids)
+            else:
+                self.subnets = self._import_subnets()
         else:
             self.vpc = self._create_vpc()
             self.subnets = self._get_created_subnets()
@@ -47,7 +55,8 @@ class NetworkStack(N8nBaseStack):
         self.efs_security_group = self._create_efs_security_group()
 
         # Add outputs
-        self._add_outputs()
+        if self.emit_outputs:
+            self._add_outputs()
 
     def _import_vpc(self) -> ec2.IVpc:
         """Import existing VPC from configuration."""
@@ -107,23 +116,44 @@ class NetworkStack(N8nBaseStack):
             enable_dns_support=True,
         )
 
-        # Add VPC flow logs for production
-        if self.is_production():
+        # Add VPC flow logs for production (S3 avoids CloudWatch Logs ingestion charges)
+        if self._is_prod:
             vpc.add_flow_log(
                 "FlowLog",
-                destination=ec2.FlowLogDestination.to_cloud_watch_logs(),
+                destination=ec2.FlowLogDestination.to_s3(self._create_flow_log_bucket(), "flow-logs/"),
                 traffic_type=ec2.FlowLogTrafficType.REJECT,
             )
 
         return vpc
 
+    def _create_flow_log_bucket(self) -> "s3.Bucket":
+        """Create the bucket receiving VPC flow logs."""
+        from aws_cdk import Duration
+        from aws_cdk import aws_s3 as s3
+
+        return s3.Bucket(
+            self,
+            "FlowLogBucket",
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            enforce_ssl=True,
+            removal_policy=self.removal_policy,
+            lifecycle_rules=[
+                s3.LifecycleRule(
+                    transitions=[
+                        s3.Transition(storage_class=s3.StorageClass.GLACIER, transition_after=Duration.days(30))
+                    ]
+                )
+            ],
+        )
+
     def _get_max_azs(self) -> int:
         """Get number of availability zones to use."""
         if self.network_config.availability_zones:
             return len(self.network_config.availability_zones)
 
         # Default based on environment
-        if self.is_production():
+        if self._is_prod:
             return 3
         elif self.environment_name == "staging":
             return 2
@@ -150,10 +180,11 @@ class NetworkStack(N8nBaseStack):
         )
 
         # Allow inbound traffic from API Gateway (will be added by access stack)
-        # For now, we'll add a self-reference for container-to-container communication
+        # For now, we'll add a self-reference for container-to-container communication.
+        # n8n only listens on its HTTP port (no queue mode/Redis in this deployment).
         sg.add_ingress_rule(
             peer=sg,
-            connection=ec2.Port.all_tcp(),
+            connection=ec2.Port.tcp(5678),
             description="Allow communication between n8n containers",
         )
 
@@ -179,16 +210,30 @@ class NetworkStack(N8nBaseStack):
 
         return sg
 
+    @functools.cached_property
+    def subnets(self) -> List[ec2.ISubnet]:
+        """Subnets for n8n resources; configured subnet IDs are imported on first access."""
+        return self._import_subnets()
+
+    @functools.cached_property
+    def subnet_ids(self) -> List[str]:
+        """IDs of the subnets, shared by outputs and consumer stacks."""
+        return [subnet.subnet_id for subnet in self.subnets]
+
+    @functools.cached_property
+    def subnet_selection(self) -> ec2.SubnetSelection:
+        """Subnet selection for the n8n subnets, shared by dependent stacks."""
+        return ec2.SubnetSelection(subnets=self.subnets)
+
     def _add_outputs(self) -> None:
         """Add stack outputs."""
         # VPC outputs
         self.add_output("VpcId", value=self.vpc.vpc_id, description="VPC ID for n8n deployment")
 
         # Subnet outputs
-        subnet_ids = [subnet.subnet_id for subnet in self.subnets]
         self.add_output(
             "SubnetIds",
-            value=Fn.join(",", subnet_ids),
+            value=Fn.join(",", self.subnet_ids),
             description="Subnet IDs for n8n deployment",
         )
 
@@ -207,10 +252,11 @@ class NetworkStack(N8nBaseStack):
 
         # Availability zones (only for created VPCs, not imported ones)
         if not self.network_config.use_existing_vpc:
-            azs = [subnet.availability_zone for subnet in self.subnets]
+            # dict.fromkeys de-duplicates while keeping subnet order, so the output is stable across synths
+            azs = list(dict.fromkeys(subnet.availability_zone for subnet in self.subnets))
             self.add_output(
                 "AvailabilityZones",
-                value=Fn.join(",", list(set(azs))),
+                value=Fn.join(",", azs),
                 description="Availability zones used",
             )
 
@@ -222,6 +268,7 @@ class NetworkStack(N8nBaseStack):
         subnet_ids: List[str],
         n8n_sg_id: str,
         efs_sg_id: str,
+        availability_zones: List[str],
     ) -> "NetworkStack":
         """Import network resources from another stack's outputs.
 
@@ -232,23 +279,41 @@ class NetworkStack(N8nBaseStack):
             subnet_ids: List of subnet IDs
             n8n_sg_id: N8n security group ID
             efs_sg_id: EFS security group ID
+            availability_zones: AZs of the subnets, e.g. from the AvailabilityZones output
 
         Returns:
             NetworkStack instance with imported resources
+
+        Raises:
+            ValueError: If the subnets cannot be spread evenly over the availability zones
         """
+        # from_vpc_attributes assigns subnets to AZs round-robin, so each AZ needs the same number of subnets
+        if not availability_zones or len(subnet_ids) % len(availability_zones):
+            raise ValueError(
+                f"Number of subnet IDs ({len(subnet_ids)}) must be a multiple of "
+                f"the number of availability zones ({len(availability_zones)})"
+            )
+
         # Create a dummy stack instance
-        from aws_cdk import Stack
+        from types import SimpleNamespace
+
+        from aws_cdk import Aws, Stack
 
         stack = NetworkStack.__new__(NetworkStack)
         Stack.__init__(stack, scope, construct_id)
-
-        # Import resources
-        stack.vpc = ec2.Vpc.from_lookup(stack, "ImportedVpc", vpc_id=vpc_id)
-
-        stack.subnets = []
-        for idx, subnet_id in enumerate(subnet_ids):
-            subnet = ec2.Subnet.from_subnet_id(stack, f"ImportedSubnet{idx}", subnet_id)
-            stack.subnets.append(subnet)
+        # The account_id/region properties read env_config, which the dummy stack never loads
+        stack.env_config = SimpleNamespace(account=Aws.ACCOUNT_ID, region=Aws.REGION)
+
+        # Import resources; the IDs are already known, so no context lookup is needed
+        stack.vpc = ec2.Vpc.from_vpc_attributes(
+            stack,
+            "ImportedVpc",
+            vpc_id=vpc_id,
+            availability_zones=list(availability_zones),
+            private_subnet_ids=subnet_ids,
+        )
+        stack.subnet_ids = list(subnet_ids)
+        stack.subnets = stack.vpc.private_subnets
 
         stack.n8n_security_group = ec2.SecurityGroup.from_security_group_id(stack, "ImportedN8nSg", n8n_sg_id)
 
@@ -2,7 +2,6 @@
 
 from aws_cdk import Duration, Fn
 from aws_cdk import aws_backup as backup
-from aws_cdk import aws_ec2 as ec2
 from aws_cdk import aws_efs as efs
 from aws_cdk import aws_events as events
 from aws_cdk import aws_iam as iam
@@ -50,7 +49,8 @@ class StorageStack(N8nBaseStack):
             self._setup_backups()
 
         # Add outputs
-        self._add_outputs()
+        if self.emit_outputs:
+            self._add_outputs()
 
     def _create_efs_file_system(self) -> efs.FileSystem:
         """Create EFS file system for n8n data."""
@@ -81,10 +81,10 @@ class StorageStack(N8nBaseStack):
             "N8nFileSystem",
             file_system_name=self.get_resource_name("efs", "n8n"),
             vpc=self.network_stack.vpc,
-            vpc_subnets=ec2.SubnetSelection(subnets=self.network_stack.subnets),
+            vpc_subnets=self.network_stack.subnet_selection,
             security_group=self.network_stack.efs_security_group,
             encrypted=True,
-            enable_automatic_backups=self.is_production(),
+            enable_automatic_backups=self._is_prod,
             lifecycle_policy=lifecycle_policy,
             performance_mode=efs.PerformanceMode.GENERAL_PURPOSE,
             throughput_mode=efs.ThroughputMode.BURSTING,
@@ -92,7 +92,7 @@ class StorageStack(N8nBaseStack):
         )
 
         # Add production-specific settings
-        if self.is_production():
+        if self._is_prod:
             # Enable replication to another region if cross-region backup is enabled
             if (
                 self.env_config.settings.backup
@@ -150,7 +150,7 @@ class StorageStack(N8nBaseStack):
                 rule_name="DailyBackup",
                 schedule_expression=events.Schedule.cron(hour="3", minute="0"),
                 delete_after=Duration.days(backup_config.retention_days),
-                enable_continuous_backup=self.is_production(),
+                enable_continuous_backup=self._is_prod,
                 start_window=Duration.hours(1),
                 completion_window=Duration.hours(2),
             )
@@ -198,9 +198,8 @@ class StorageStack(N8nBaseStack):
         )
 
         # Mount target info
-        mount_targets = []
-        for subnet in self.network_stack.subnets:
-            mount_targets.append(f"{self.file_system.file_system_id}.efs.{self.region}.amazonaws.com")
+        mount_target = f"{self.file_system.file_system_id}.efs.{self.region}.amazonaws.com"
+        mount_targets = [mount_target] * len(self.network_stack.subnet_ids)
 
         self.add_output(
             "MountTargets",
@@ -0,0 +1,15 @@
+"""Pytest configuration shared by all test suites."""
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    """Keep pure-Python tests on a single xdist worker.
+
+    They are fast enough to run serially, and pinning them leaves the other
+    workers free for the CDK construct tests, which xdist spreads by load
+    when run with ``-n auto --dist loadgroup``.
+    """
+    for item in items:
+        if item.get_closest_marker("pure"):
+            item.add_marker(pytest.mark.xdist_group("pure"))
@@ -0,0 +1,231 @@
+"""Pytest configuration and fixtures for integration tests."""
+
+import functools
+import pickle
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+from aws_cdk import App, Environment
+
+from n8n_deploy.config import ConfigLoader
+from n8n_deploy.config.models import DatabaseConfig, DatabaseType
+from n8n_deploy.stacks.compute_stack import ComputeStack
+from n8n_deploy.stacks.database_stack import DatabaseStack
+from n8n_deploy.stacks.network_stack import NetworkStack
+from n8n_deploy.stacks.storage_stack import StorageStack
+
+# Test configuration, built once at import. The loader only reads it; tests
+# mutate the validated N8nConfig copies returned by load_config().
+_TEST_CONFIG = MappingProxyType(
+    {
+        "global": {
+            "project_name": "test-n8n",
+            "organization": "test-org",
+            "tags": {"Project": "n8n-test", "Environment": "{{ environment }}"},
+        },
+        "defaults": {
+            "fargate": {
+                "cpu": 256,
+                "memory": 512,
+                "spot_percentage": 80,
+                "n8n_version": "1.94.1",
+            },
+            "efs": {"lifecycle_days": 30},
+            "monitoring": {"log_retention_days": 30},
+        },
+        "environments": {
+            "test": {
+                "account": "123456789012",
+                "region": "us-east-1",
+                "settings": {
+                    "fargate": {"cpu": 256, "memory": 512},
+                    "scaling": {"min_tasks": 1, "max_tasks": 3},
+                    "networking": {
+                        "use_existing_vpc": False,
+                        "vpc_cidr": "10.0.0.0/16",
+                    },
+                    "access": {
+                        "cloudfront_enabled": True,
+                        "api_gateway_throttle": 100,
+                    },
+                    "monitoring": {
+                        "alarm_email": "test@example.com",
+                        "enable_container_insights": True,
+                    },
+                },
+            }
+        },
+    }
+)
+
+
+def assert_attrs(obj, *names):
+    """Assert that obj has every attribute in names, reporting all that are missing."""
+    missing = [name for name in names if not hasattr(obj, name)]
+    assert not missing, f"{type(obj).__name__} is missing attributes {missing}"
+
+
+@pytest.fixture(scope="session")
+def config_loader():
+    """Create config loader with test configuration.
+
+    load_config() validates each environment once and hands out unpickled
+    copies of the cached N8nConfig, so tests that mutate the returned config
+    do not affect each other. Unpickling is cheaper than model_copy(deep=True).
+    """
+    loader = ConfigLoader(raw_config=_TEST_CONFIG)
+    validate_config = loader.load_config
+
+    @functools.lru_cache(maxsize=8)
+    def pickled_config(environment, stack_type):
+        return pickle.dumps(validate_config(environment, stack_type))
+
+    def load_config(environment, stack_type=None):
+        return pickle.loads(pickled_config(environment, stack_type))
+
+    loader.load_config = load_config
+    return loader
+
+
+@pytest.fixture
+def fresh_config(config_loader):
+    """Return a private copy of the test environment config, safe to mutate."""
+    return config_loader.load_config("test")
+
+
+@pytest.fixture(scope="session")
+def env_for():
+    """Return a function that builds the CDK Environment of a configured environment.
+
+    Environments are plain structs, so one instance is reused per (account, region).
+    """
+    cdk_environment = functools.lru_cache(maxsize=None)(
+        lambda account, region: Environment(account=account, region=region)
+    )
+
+    def env_for(config, environment):
+        env_config = config.environments[environment]
+        return cdk_environment(env_config.account, env_config.region)
+
+    return env_for
+
+
+@pytest.fixture
+def loaded(fresh_config, env_for):
+    """Return the private test config together with its environment config and CDK environment.
+
+    Returns:
+        SimpleNamespace with config, env_config and env attributes
+    """
+    return SimpleNamespace(
+        config=fresh_config,
+        env_config=fresh_config.environments["test"],
+        env=env_for(fresh_config, "test"),
+    )
+
+
+@pytest.fixture(scope="session")
+def baseline_stacks(config_loader, env_for):
+    """Build the minimal network, storage and compute stacks once for tests that only read them.
+
+    Tests must not add constructs to the returned App; those that need more
+    stacks build their own App or use full_stack_baseline.
+
+    Returns:
+        Tuple of (app, config, env, network_stack, storage_stack, compute_stack)
+    """
+    app = App(
+        context={
+            "environment": "test",
+            "@aws-cdk/core:stackRelativeExports": True,
+        }
+    )
+    environment = "test"
+    config = config_loader.load_config(environment)
+    env = env_for(config, environment)
+
+    network_stack = NetworkStack(
+        app,
+        f"{config.global_config.project_name}-{environment}-network",
+        config=config,
+        environment=environment,
+        env=env,
+    )
+
+    storage_stack = StorageStack(
+        app,
+        f"{config.global_config.project_name}-{environment}-storage",
+        config=config,
+        environment=environment,
+        network_stack=network_stack,
+        env=env,
+    )
+
+    compute_stack = ComputeStack(
+        app,
+        f"{config.global_config.project_name}-{environment}-compute",
+        config=config,
+        environment=environment,
+        network_stack=network_stack,
+        storage_stack=storage_stack,
+        env=env,
+    )
+
+    return app, config, env, network_stack, storage_stack, compute_stack
+
+
+@pytest.fixture(scope="session")
+def full_stack_baseline(config_loader, env_for):
+    """Build the dependency stacks for a full deployment once per session.
+
+    Uses its own App and a config with a PostgreSQL database, so it does not
+    touch the stacks or config shared through baseline_stacks.
+
+    Returns:
+        Tuple of (app, config, env, network_stack, storage_stack, database_stack, compute_stack)
+    """
+    app = App(
+        context={
+            "environment": "test",
+            "@aws-cdk/core:stackRelativeExports": True,
+        }
+    )
+    environment = "test"
+    config = config_loader.load_config(environment)
+    config.environments[environment].settings.database = DatabaseConfig(
+        type=DatabaseType.POSTGRES,
+        use_existing=False,
+        instance_class="db.t4g.micro",
+    )
+    env = env_for(config, environment)
+
+    network_stack = NetworkStack(app, "test-network", config=config, environment=environment, env=env)
+    storage_stack = StorageStack(
+        app,
+        "test-storage",
+        config=config,
+        environment=environment,
+        network_stack=network_stack,
+        env=env,
+    )
+    database_stack = DatabaseStack(
+        app,
+        "test-database",
+        config=config,
+        environment=environment,
+        network_stack=network_stack,
+        env=env,
+    )
+    compute_stack = ComputeStack(
+        app,
+        "test-compute",
+        config=config,
+        environment=environment,
+        network_stack=network_stack,
+        storage_stack=storage_stack,
+        database_endpoint=database_stack.endpoint if hasattr(database_stack, "endpoint") else None,
+        database_secret=database_stack.secret if hasattr(database_stack, "secret") else None,
+        env=env,
+    )
+
+    return app, config, env, network_stack, storage_stack, database_stack, compute_stack
@@ -1,15 +1,40 @@
 """Unit tests for base stack."""
 
+from unittest.mock import DEFAULT, PropertyMock, patch
+
 import pytest
-from aws_cdk import RemovalPolicy
+from aws_cdk import App, RemovalPolicy, Stack
 from aws_cdk.assertions import Template
 
 from n8n_deploy.stacks.base_stack import N8nBaseStack
 
 
+@pytest.fixture
+def bare_stack():
+    """Build N8nBaseStack instances without creating the CDK stack behind them.
+
+    Stack.__init__ is skipped (and with it the jsii round-trip), so only the
+    pure-Python helpers of the returned stack can be used.
+    """
+
+    def make(config, environment="test"):
+        with patch.object(Stack, "__init__", return_value=None), patch.multiple(
+            N8nBaseStack,
+            node=PropertyMock(),
+            stack_name=PropertyMock(return_value=f"{environment}-stack"),
+            _apply_tags=DEFAULT,
+        ):
+            stack = N8nBaseStack.__new__(N8nBaseStack)
+            stack.__init__(None, f"{environment}-stack", config=config, environment=environment)
+        return stack
+
+    return make
+
+
 class TestBaseStack:
     """Test base stack functionality."""
 
+    @pytest.mark.cdk_construct
     def test_base_stack_initialization(self, mock_app, test_config):
         """Test base stack initialization."""
         stack = N8nBaseStack(mock_app, "test-stack", config=test_config, environment="test")
@@ -19,6 +44,7 @@ class TestBaseStack:
         assert stack.env_config == test_config.get_environment("test")
         assert stack.stack_prefix == "test-n8n-test"
 
+    @pytest.mark.cdk_construct
     @pytest.mark.skip(reason="Template synthesis requires valid AWS environment format")
     def test_tag_application(self, mock_app, test_config):
         """Test that tags are properly applied."""
@@ -31,61 +57,83 @@ class TestBaseStack:
         # through the synthesized template or use CDK's tag APIs
         assert stack.node.find_all()  # Verify stack has nodes
 
-    def test_resource_naming(self, mock_app, test_config):
-        """Test resource naming convention."""
-        stack = N8nBaseStack(mock_app, "test-stack", config=test_config, environment="test")
+    @pytest.mark.cdk_construct
+    def test_fast_synth_skips_tags(self, mock_app, test_config):
+        """Test that CDK_FAST_SYNTH skips tag application."""
+        with patch("n8n_deploy.stacks.base_stack._FAST_SYNTH", True), patch.object(
+            N8nBaseStack, "_apply_tags"
+        ) as apply_tags:
+            N8nBaseStack(mock_app, "fast-stack", config=test_config, environment="test")
 
-        # Test resource naming
-        assert stack.get_resource_name("vpc") == "test-n8n-test-vpc"
-        assert stack.get_resource_name("vpc", "main") == "test-n8n-test-vpc-main"
-        assert stack.get_resource_name("sg", "n8n") == "test-n8n-test-sg-n8n"
+        apply_tags.assert_not_called()
 
-    def test_removal_policy(self, mock_app, test_config):
-        """Test removal policy based on environment."""
-        # Add dev environment to config
-        test_config.environments["dev"] = test_config.environments["test"]
-
-        # Test dev environment
-        dev_stack = N8nBaseStack(
-            mock_app,
-            "dev-stack",
-            config=test_config,
-            environment="dev",  # Using dev environment for DESTROY policy
-        )
-        assert dev_stack.removal_policy == RemovalPolicy.DESTROY
+    @pytest.mark.cdk_construct
+    def test_emit_outputs_context(self, mock_app, test_config):
+        """Test that outputs can be switched off with the emit_outputs context."""
+        stack = N8nBaseStack(mock_app, "default-stack", config=test_config, environment="test")
+        assert stack.emit_outputs is True
 
-        # Test production environment
-        test_config.environments["production"] = test_config.environments["test"]
-        prod_stack = N8nBaseStack(mock_app, "prod-stack", config=test_config, environment="production")
-        assert prod_stack.removal_policy == RemovalPolicy.RETAIN
+        app = App(context={"emit_outputs": "false"})
+        stack = N8nBaseStack(app, "no-outputs-stack", config=test_config, environment="test")
+        assert stack.emit_outputs is False
 
-    def test_is_production_is_development(self, mock_app, test_config):
-        """Test environment detection methods."""
-        # Add production environment
-        test_config.environments["production"] = test_config.environments["test"]
-        test_config.environments["dev"] = test_config.environments["test"]
+    @pytest.mark.cdk_construct
+    def test_depend_on_is_idempotent(self, mock_app, test_config):
+        """Test that repeated dependencies on the same stack are added once."""
+        target = N8nBaseStack(mock_app, "target-stack", config=test_config, environment="test")
+        stack = N8nBaseStack(mock_app, "dependent-stack", config=test_config, environment="test")
 
-        prod_stack = N8nBaseStack(mock_app, "prod-stack", config=test_config, environment="production")
-        assert prod_stack.is_production() is True
-        assert prod_stack.is_development() is False
+        with patch.object(stack, "add_dependency") as add_dependency:
+            stack.depend_on(target)
+            stack.depend_on(target)
 
-        dev_stack = N8nBaseStack(mock_app, "dev-stack", config=test_config, environment="dev")
-        assert dev_stack.is_production() is False
-        assert dev_stack.is_development() is True
+        add_dependency.assert_called_once_with(target)
 
-    def test_spot_enabled(self, mock_app, test_config):
-        """Test spot instance detection."""
-        stack = N8nBaseStack(mock_app, "test-stack", config=test_config, environment="test")
+    @pytest.mark.pure
+    def test_resource_naming(self, bare_stack, test_config):
+        """Test resource naming convention."""
+        stack = bare_stack(test_config, "test")
 
+        # Test resource naming
+        assert stack.get_resource_name("vpc") == "test-n8n-test-vpc"
+        assert stack.get_resource_name("vpc", "main") == "test-n8n-test-vpc-main"
+        assert stack.get_resource_name("sg", "n8n") == "test-n8n-test-sg-n8n"
+
+    @pytest.fixture
+    def stack_env(self, request, bare_stack, test_config):
+        """Build a stack for the environment given by indirect parametrization."""
+        environment = request.param
+        test_config.environments[environment] = test_config.environments["test"].model_copy(deep=True)
+        return bare_stack(test_config, environment)
+
+    @pytest.mark.pure
+    @pytest.mark.parametrize(
+        "stack_env,removal_policy,is_prod,is_dev",
+        [
+            ("dev", RemovalPolicy.DESTROY, False, True),
+            ("production", RemovalPolicy.RETAIN, True, False),
+        ],
+        indirect=["stack_env"],
+    )
+    def test_environment_settings(self, stack_env, removal_policy, is_prod, is_dev):
+        """Test removal policy, environment detection and spot detection per environment."""
+        stack = stack_env
+
+        assert stack.removal_policy == removal_policy
+        assert stack.is_production() is is_prod
+        assert stack.is_development() is is_dev
         # Test config has spot_percentage = 80
         assert stack.is_spot_enabled is True
 
-        # Test with spot disabled
+    @pytest.mark.pure
+    def test_spot_disabled(self, bare_stack, test_config):
+        """Test spot instance detection with spot disabled."""
         test_config.environments["test"].settings.fargate.spot_percentage = 0
-        stack2 = N8nBaseStack(mock_app, "test-stack-2", config=test_config, environment="test")
-        assert stack2.is_spot_enabled is False
+        stack = bare_stack(test_config, "test")
+        assert stack.is_spot_enabled is False
 
-    def test_get_shared_resource(self, mock_app, test_config):
+    @pytest.mark.pure
+    def test_get_shared_resource(self, bare_stack, test_config):
         """Test shared resource retrieval."""
         # Add shared resources to config
         from n8n_deploy.config.models import SharedResources
@@ -98,16 +146,17 @@ class TestBaseStack:
             networking={"vpc_id": "vpc-shared123"},
         )
 
-        stack = N8nBaseStack(mock_app, "test-stack", config=test_config, environment="test")
+        stack = bare_stack(test_config, "test")
 
         assert stack.get_shared_resource("security", "kms_key_arn") == "arn:aws:kms:us-east-1:123:key/test"
         assert stack.get_shared_resource("networking", "vpc_id") == "vpc-shared123"
         assert stack.get_shared_resource("storage", "bucket") is None
         assert stack.get_shared_resource("invalid", "test") is None
 
-    def test_output_export_logic(self, mock_app, test_config):
+    @pytest.mark.pure
+    def test_output_export_logic(self, bare_stack, test_config):
         """Test output export determination."""
-        stack = N8nBaseStack(mock_app, "test-stack", config=test_config, environment="test")
+        stack = bare_stack(test_config, "test")
 
         # Test exportable outputs
         assert stack.should_export_output("VpcId") is True
@@ -119,15 +168,41 @@ class TestBaseStack:
         assert stack.should_export_output("RandomMetric") is False
         assert stack.should_export_output("InternalValue") is False
 
-    def test_component_enabled(self, mock_app, test_config):
+    @pytest.mark.pure
+    def test_component_enabled(self, bare_stack, test_config):
         """Test component enablement check."""
         # Add components to features
         test_config.environments["test"].settings.features = {"components": ["fargate", "efs", "monitoring"]}
 
-        stack = N8nBaseStack(mock_app, "test-stack", config=test_config, environment="test")
+        stack = bare_stack(test_config, "test")
 
         assert stack.get_component_enabled("fargate") is True
         assert stack.get_component_enabled("efs") is True
         assert stack.get_component_enabled("monitoring") is True
         assert stack.get_component_enabled("database") is False
         assert stack.get_component_enabled("waf") is False
+
+    @pytest.mark.pure
+    def test_cost_allocation_tags(self, bare_stack, test_config):
+        """Test cost allocation tags prefer global tags over environment tags."""
+        test_config.global_config.cost_allocation_tags = ["Project", "CostCenter", "Missing"]
+        test_config.environments["test"].tags = {"Project": "env-project", "CostCenter": "eng"}
+
+        stack = bare_stack(test_config, "test")
+
+        assert stack.get_cost_allocation_tags() == {"Project": "n8n", "CostCenter": "eng"}
+
+    @pytest.mark.cdk_construct
+    def test_merged_env_config_sees_config_edits(self, mock_app, test_config):
+        """Test that each stack merges defaults into the config as it is when the stack is built."""
+        from n8n_deploy.config.models import DefaultsConfig, MonitoringConfig
+
+        test_config.defaults = DefaultsConfig(monitoring=MonitoringConfig(log_retention_days=7))
+
+        stack1 = N8nBaseStack(mock_app, "stack-1", config=test_config, environment="test")
+        test_config.environments["test"].settings.fargate.cpu = 1024
+        stack2 = N8nBaseStack(mock_app, "stack-2", config=test_config, environment="test")
+
+        assert stack1.env_config.settings.fargate.cpu == 256
+        assert stack2.env_config.settings.fargate.cpu == 1024
+        assert stack2.env_config is not test_config.environments["test"]
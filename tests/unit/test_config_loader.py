@@ -42,6 +42,40 @@ class TestConfigLoader:
         assert config.global_config.organization == "test-org"
         assert "test" in config.environments
 
+    def test_load_raw_config(self, tmp_path):
+        """Test that a pre-parsed configuration is used without reading a file."""
+        config_data = {
+            "global": {
+                "project_name": "test",
+                "organization": "test",
+            },
+            "environments": {
+                "test": {
+                    "account": "123456789012",
+                    "region": "us-east-1",
+                    "settings": {},
+                }
+            },
+        }
+
+        loader = ConfigLoader(str(tmp_path / "missing.yaml"), raw_config=config_data)
+        config = loader.load_config("test")
+
+        assert config.global_config.project_name == "test"
+        assert loader.get_available_environments() == ["test"]
+        assert loader.validate_config_file() is True
+
+    def test_empty_raw_config_is_not_replaced_by_file(self, tmp_path):
+        """Test that an injected empty configuration does not fall back to reading the file."""
+        config_file = tmp_path / "system.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump({"global": {"project_name": "from-file", "organization": "test"}}, f)
+
+        loader = ConfigLoader(str(config_file), raw_config={})
+
+        with pytest.raises(ValueError, match="No configuration loaded"):
+            loader.load_config("test")
+
     def test_load_nonexistent_file(self):
         """Test loading a non-existent configuration file."""
         loader = ConfigLoader("nonexistent.yaml")
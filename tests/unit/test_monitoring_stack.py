@@ -560,4 +560,4 @@ class TestMonitoringStack:
         assert "Webhook Performance" in dashboard_body
         assert "Performance Metrics" in dashboard_body
         assert "Authentication Errors" in dashboard_body
-        assert "Workflow Success Rate" in dashboard_body
+        assert "Errors & Success (24h)" in dashboard_body
@@ -3,6 +3,7 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from aws_cdk import aws_ec2 as ec2
 
 from n8n_deploy.config.models import NetworkingConfig
 from n8n_deploy.stacks.network_stack import NetworkStack
@@ -175,3 +176,67 @@ class TestNetworkStack:
         assert any("vpc-123" in str(val) for val in output_names)
         # Check security group outputs
         assert any("sg-123" in str(val) for val in output_names)
+
+
+class TestNetworkStackImport:
+    """Test importing existing network resources."""
+
+    def test_configured_subnets_imported_lazily(self, mock_app, test_config):
+        """Test that configured subnet IDs are only imported as constructs on first use."""
+        test_config.environments["test"].settings.networking = NetworkingConfig(
+            use_existing_vpc=True,
+            vpc_id="vpc-existing123",
+            subnet_ids=["subnet-1", "subnet-2"],
+        )
+
+        # Stand in for the context provider lookup with a VPC built from known attributes
+        def lookup_vpc(scope, construct_id, *, vpc_id, **kwargs):
+            return ec2.Vpc.from_vpc_attributes(
+                scope, construct_id, vpc_id=vpc_id, availability_zones=["us-east-1a"], private_subnet_ids=["subnet-x"]
+            )
+
+        with patch.object(ec2.Vpc, "from_lookup", side_effect=lookup_vpc), patch.object(
+            ec2.Subnet, "from_subnet_id", wraps=ec2.Subnet.from_subnet_id
+        ) as from_subnet_id:
+            stack = NetworkStack(mock_app, "network-stack", config=test_config, environment="test")
+
+            assert stack.subnet_ids == ["subnet-1", "subnet-2"]
+            assert stack.node.try_find_child("ImportedSubnet0") is None
+            from_subnet_id.assert_not_called()
+
+            assert [stack.resolve(subnet.subnet_id) for subnet in stack.subnets] == ["subnet-1", "subnet-2"]
+            assert from_subnet_id.call_count == 2
+            assert stack.subnets is stack.subnets
+            assert from_subnet_id.call_count == 2
+
+    @patch("n8n_deploy.stacks.network_stack.ec2.Vpc.from_lookup")
+    def test_import_from_outputs_skips_lookup(self, mock_vpc_lookup, mock_app):
+        """Test that importing from outputs builds the VPC without a context lookup."""
+        stack = NetworkStack.import_from_outputs(
+            mock_app,
+            "imported-network",
+            vpc_id="vpc-123",
+            subnet_ids=["subnet-1", "subnet-2"],
+            n8n_sg_id="sg-n8n",
+            efs_sg_id="sg-efs",
+            availability_zones=["us-east-1a", "us-east-1b"],
+        )
+
+        mock_vpc_lookup.assert_not_called()
+        assert stack.subnet_ids == ["subnet-1", "subnet-2"]
+        assert [stack.resolve(subnet.subnet_id) for subnet in stack.subnets] == ["subnet-1", "subnet-2"]
+        assert [stack.resolve(subnet.availability_zone) for subnet in stack.subnets] == ["us-east-1a", "us-east-1b"]
+
+    @pytest.mark.parametrize("availability_zones", [[], ["us-east-1a", "us-east-1b"]])
+    def test_import_from_outputs_rejects_uneven_subnets(self, mock_app, availability_zones):
+        """Test that subnets which cannot be spread evenly over the AZs are rejected."""
+        with pytest.raises(ValueError, match="multiple of the number of availability zones"):
+            NetworkStack.import_from_outputs(
+                mock_app,
+                "imported-network",
+                vpc_id="vpc-123",
+                subnet_ids=["subnet-1", "subnet-2", "subnet-3"],
+                n8n_sg_id="sg-n8n",
+                efs_sg_id="sg-efs",
+                availability_zones=availability_zones,
+            )
@@ -50,6 +50,7 @@ class TestStorageStack:
         stack = Mock(spec=NetworkStack)
         stack.vpc = vpc_mock
         stack.subnets = [Mock() for _ in range(2)]
+        stack.subnet_ids = ["subnet-1", "subnet-2"]
         stack.efs_security_group = security_group_mock
         return stack
 